@@ -12,8 +12,419 @@ import bmesh
 import math
 import os
 import re
-from mathutils import Vector
-from math import degrees
+import hashlib
+import struct
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from bpy.app.handlers import persistent
+from mathutils import kdtree
+
+# OpenImageIO входит в поставку Blender 4, но может отсутствовать в сборке
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
+
+# Функция для чтения индексов материалов всех полигонов одним вызовом
+def read_material_indices(mesh):
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", indices)
+    return indices
+
+
+# Функция для записи индексов материалов всех полигонов одним вызовом
+def write_material_indices(mesh, indices):
+    mesh.polygons.foreach_set("material_index", np.ascontiguousarray(indices, dtype=np.int32))
+    mesh.update()
+
+
+# Функция для получения центров полигонов в мировых координатах одним массивом
+def get_face_centers_world(obj):
+    mesh = obj.data
+    centers = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("center", centers)
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    return centers.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+# Соответствие полигонов по ближайшему центру
+# KD-дерево строится один раз по центрам полигонов источника
+def map_faces_nearest(obj_from, obj_to, max_distance=0.0):
+    return map_centers_nearest(get_face_centers_world(obj_from), get_face_centers_world(obj_to), max_distance)
+
+
+# Соответствие точек цели ближайшим точкам источника через KD-дерево
+def map_centers_nearest(src_centers, tgt_centers, max_distance=0.0):
+    tree = kdtree.KDTree(len(src_centers))
+    for i, co in enumerate(src_centers.tolist()):
+        tree.insert(co, i)
+    tree.balance()
+
+    mapping = np.full(len(tgt_centers), -1, dtype=np.int64)
+    find = tree.find
+    for i, co in enumerate(tgt_centers.tolist()):
+        _co, index, dist = find(co)
+        if index is not None and (max_distance <= 0.0 or dist <= max_distance):
+            mapping[i] = index
+    return mapping
+
+
+# Шаг квантования центров полигонов для точного сопоставления
+EXACT_MATCH_PRECISION = 0.0001
+
+# Допуск поиска ближайшего центра для полигонов, не совпавших по хешу
+EXACT_MATCH_FALLBACK_DISTANCE = 0.001
+
+
+# Функция для вычисления центров полигонов в float64 по координатам вершин
+# Сумма в float64 не зависит от порядка углов полигона
+# Возвращает (центры, количество вершин полигонов)
+def get_face_centers_precise(obj, world=False):
+    mesh = obj.data
+    loop_starts, loop_totals = get_loop_ranges(mesh)
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    coords = coords.astype(np.float64).reshape(-1, 3)
+    if world:
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        coords = coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+    if len(loop_starts) == 0:
+        return np.empty((0, 3), dtype=np.float64), loop_totals
+
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    centers = np.add.reduceat(coords[loop_verts], loop_starts, axis=0) / loop_totals[:, None]
+    return centers, loop_totals
+
+
+# Функция для получения ключей полигонов: квантованный центр и количество вершин
+def get_face_hash_keys(centers, loop_totals, precision=EXACT_MATCH_PRECISION):
+    quantized = np.round(centers / precision).astype(np.int64)
+    return zip(quantized[:, 0].tolist(), quantized[:, 1].tolist(), quantized[:, 2].tolist(), loop_totals.tolist())
+
+
+# Точное соответствие полигонов по хешу квантованного центра
+# Подходит для одинаковой геометрии с перемешанным порядком полигонов
+# При одинаковых матрицах объектов сравнение идет в локальных координатах, иначе в мировых
+def map_faces_exact(obj_from, obj_to):
+    same_space = np.array_equal(np.array(obj_from.matrix_world), np.array(obj_to.matrix_world))
+    src_centers, src_totals = get_face_centers_precise(obj_from, world=not same_space)
+    tgt_centers, tgt_totals = get_face_centers_precise(obj_to, world=not same_space)
+
+    source_index = {}
+    for i, key in enumerate(get_face_hash_keys(src_centers, src_totals)):
+        source_index.setdefault(key, i)
+
+    get = source_index.get
+    mapping = np.fromiter((get(key, -1) for key in get_face_hash_keys(tgt_centers, tgt_totals)),
+                          dtype=np.int64, count=len(tgt_centers))
+
+    # Центры на границе ячейки квантования или с погрешностью запеченной трансформации
+    # ищутся как ближайшие с тем же количеством вершин
+    unmatched = np.nonzero(mapping < 0)[0]
+    if len(unmatched) and len(src_centers):
+        nearest = map_centers_nearest(src_centers, tgt_centers[unmatched], EXACT_MATCH_FALLBACK_DISTANCE)
+        found = (nearest >= 0) & (src_totals[np.maximum(nearest, 0)] == tgt_totals[unmatched])
+        mapping[unmatched[found]] = nearest[found]
+
+    return mapping
+
+
+# Функция для получения начала и количества углов (loops) каждого полигона
+def get_loop_ranges(mesh):
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int64)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int64)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return loop_starts, loop_totals
+
+
+# Функция для получения UV-центров полигонов по указанному UV-каналу
+def get_face_uv_centers(mesh, uv_name):
+    uv_layer = mesh.uv_layers.get(uv_name)
+    if uv_layer is None:
+        return None
+
+    if len(mesh.polygons) == 0:
+        return np.empty((0, 2), dtype=np.float32)
+
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get("uv", uvs)
+    loop_starts, loop_totals = get_loop_ranges(mesh)
+
+    sums = np.add.reduceat(uvs.reshape(-1, 2), loop_starts, axis=0)
+    return sums / loop_totals[:, None]
+
+
+# Соответствие полигонов по UV-центрам через KD-дерево по точкам (u, v, 0)
+# Время поиска не зависит от того, сколько UV-центров наложено друг на друга
+# tolerance - максимальное расстояние в единицах UV (0 - без ограничения)
+def map_faces_uv(obj_from, obj_to, uv_name, tolerance=0.0):
+    src = get_face_uv_centers(obj_from.data, uv_name)
+    tgt = get_face_uv_centers(obj_to.data, uv_name)
+    if src is None or tgt is None:
+        return None
+
+    if len(src) == 0 or len(tgt) == 0:
+        return np.full(len(tgt), -1, dtype=np.int64)
+
+    return map_centers_nearest(np.column_stack((src, np.zeros(len(src)))),
+                               np.column_stack((tgt, np.zeros(len(tgt)))), tolerance)
+
+
+# Функция для группировки мешей по общему datablock
+# Инстансы с одним мешем обрабатываются один раз, через первый объект группы
+def group_objects_by_mesh(objects):
+    groups = {}
+    for obj in objects:
+        if obj.type == 'MESH':
+            groups.setdefault(obj.data, []).append(obj)
+    return groups
+
+
+# Функция для строки отчета с количеством объектов и уникальных мешей
+def format_mesh_counts(groups):
+    object_count = sum(len(objs) for objs in groups.values())
+    return f"объектов: {object_count}, уникальных мешей: {len(groups)}"
+
+
+# Функция для построения соответствия полигонов цели полигонам источника
+# Возвращает массив индексов источника для каждого полигона цели (-1 - нет соответствия)
+# или None, если соответствие построить невозможно
+def compute_face_mapping(obj_from, obj_to, mode, max_distance=0.0, uv_name="UVChannel_1", uv_tolerance=0.0):
+    if mode == 'INDEX':
+        if len(obj_from.data.polygons) != len(obj_to.data.polygons):
+            return None
+        return np.arange(len(obj_to.data.polygons), dtype=np.int64)
+    if mode == 'NEAREST':
+        return map_faces_nearest(obj_from, obj_to, max_distance)
+    if mode == 'EXACT':
+        return map_faces_exact(obj_from, obj_to)
+    if mode == 'UV':
+        return map_faces_uv(obj_from, obj_to, uv_name, uv_tolerance)
+    return None
+
+
+# Функция для переноса значений по соответствию полигонов
+# Полигоны без соответствия получают значение fill
+def gather_by_mapping(values, mapping, fill=0):
+    result = np.full(len(mapping), fill, dtype=values.dtype)
+    matched = mapping >= 0
+    result[matched] = values[mapping[matched]]
+    return result
+
+
+# Ключ foreach_get/foreach_set, число компонент и тип массива для каждого типа атрибута
+ATTRIBUTE_ARRAY_FORMATS = {
+    'FLOAT': ("value", 1, np.float32),
+    'INT': ("value", 1, np.int32),
+    'INT8': ("value", 1, np.int32),
+    'BOOLEAN': ("value", 1, np.bool_),
+    'FLOAT2': ("vector", 2, np.float32),
+    'INT32_2D': ("value", 2, np.int32),
+    'FLOAT_VECTOR': ("vector", 3, np.float32),
+    'FLOAT_COLOR': ("color", 4, np.float32),
+    'BYTE_COLOR': ("color", 4, np.float32),
+    'QUATERNION': ("value", 4, np.float32),
+}
+
+# Атрибуты, которые не переносятся общим механизмом
+SKIPPED_ATTRIBUTES = {"position", "material_index"}
+
+
+# Функция для чтения значений атрибута одним массивом
+def read_attribute(attr):
+    key, components, dtype = ATTRIBUTE_ARRAY_FORMATS[attr.data_type]
+    values = np.empty(len(attr.data) * components, dtype=dtype)
+    attr.data.foreach_get(key, values)
+    return values.reshape(-1, components)
+
+
+# Функция для записи значений атрибута одним вызовом
+def write_attribute(attr, values):
+    key, _components, dtype = ATTRIBUTE_ARRAY_FORMATS[attr.data_type]
+    attr.data.foreach_set(key, np.ascontiguousarray(values, dtype=dtype).ravel())
+
+
+# Функция для определения категории атрибута: UV, COLOR, SHARP или CUSTOM
+def get_attribute_category(mesh, attr):
+    if attr.name in mesh.uv_layers:
+        return 'UV'
+    if attr.name in mesh.color_attributes:
+        return 'COLOR'
+    if attr.name in {"sharp_edge", "sharp_face"}:
+        return 'SHARP'
+    return 'CUSTOM'
+
+
+# Функция для получения мировых координат вершин каждого угла меша
+def get_loop_positions_world(obj):
+    mesh = obj.data
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    coords = coords.astype(np.float64).reshape(-1, 3)
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    coords = coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    return coords[loop_verts]
+
+
+# Функция для построения соответствия элементов всех доменов по соответствию полигонов
+# Каждый угол сопоставляется ближайшему по положению углу найденного полигона источника,
+# вершины - через углы, ребра - по паре сопоставленных вершин (не зависит от направления обхода)
+def build_domain_mappings(obj_from, obj_to, face_mapping):
+    src_mesh = obj_from.data
+    tgt_mesh = obj_to.data
+    src_starts, src_totals = get_loop_ranges(src_mesh)
+    tgt_totals = get_loop_ranges(tgt_mesh)[1]
+
+    tgt_loop_count = len(tgt_mesh.loops)
+    tgt_loop_faces = np.repeat(np.arange(len(tgt_totals)), tgt_totals)
+
+    src_faces = face_mapping[tgt_loop_faces]
+    matched = src_faces >= 0
+    matched_loops = np.nonzero(matched)[0]
+    matched_faces = src_faces[matched]
+
+    # Перебираем k-й угол полигона источника, оставляя только полигоны, где он есть
+    src_positions = get_loop_positions_world(obj_from)
+    tgt_positions = get_loop_positions_world(obj_to)[matched_loops]
+    best_loops = src_starts[matched_faces].copy()
+    best_distances = np.full(len(matched_loops), np.inf)
+    active = np.arange(len(matched_loops))
+    k = 0
+    while len(active):
+        candidates = src_starts[matched_faces[active]] + k
+        distances = ((src_positions[candidates] - tgt_positions[active]) ** 2).sum(axis=1)
+        better = distances < best_distances[active]
+        best_distances[active[better]] = distances[better]
+        best_loops[active[better]] = candidates[better]
+        k += 1
+        active = active[src_totals[matched_faces[active]] > k]
+
+    corner_mapping = np.full(tgt_loop_count, -1, dtype=np.int64)
+    corner_mapping[matched_loops] = best_loops
+
+    src_loop_verts = np.empty(len(src_mesh.loops), dtype=np.int64)
+    tgt_loop_verts = np.empty(tgt_loop_count, dtype=np.int64)
+    src_mesh.loops.foreach_get("vertex_index", src_loop_verts)
+    tgt_mesh.loops.foreach_get("vertex_index", tgt_loop_verts)
+    point_mapping = np.full(len(tgt_mesh.vertices), -1, dtype=np.int64)
+    point_mapping[tgt_loop_verts[matched]] = src_loop_verts[corner_mapping[matched]]
+
+    # Ребро цели -> ребро источника с той же неупорядоченной парой вершин
+    src_vertex_count = len(src_mesh.vertices)
+    src_edge_verts = np.empty(len(src_mesh.edges) * 2, dtype=np.int64)
+    tgt_edge_verts = np.empty(len(tgt_mesh.edges) * 2, dtype=np.int64)
+    src_mesh.edges.foreach_get("vertices", src_edge_verts)
+    tgt_mesh.edges.foreach_get("vertices", tgt_edge_verts)
+    src_edge_verts = np.sort(src_edge_verts.reshape(-1, 2), axis=1)
+    src_keys = src_edge_verts[:, 0] * src_vertex_count + src_edge_verts[:, 1]
+    src_order = np.argsort(src_keys)
+    src_keys = src_keys[src_order]
+
+    edge_mapping = np.full(len(tgt_mesh.edges), -1, dtype=np.int64)
+    edge_ends = np.sort(point_mapping[tgt_edge_verts.reshape(-1, 2)], axis=1)
+    valid = np.nonzero((edge_ends[:, 0] >= 0) & (edge_ends[:, 0] != edge_ends[:, 1]))[0]
+    if len(valid) and len(src_keys):
+        keys = edge_ends[valid, 0] * src_vertex_count + edge_ends[valid, 1]
+        positions = np.minimum(np.searchsorted(src_keys, keys), len(src_keys) - 1)
+        found = src_keys[positions] == keys
+        edge_mapping[valid[found]] = src_order[positions[found]]
+
+    return {'FACE': face_mapping, 'CORNER': corner_mapping, 'POINT': point_mapping, 'EDGE': edge_mapping}
+
+
+# Функция для переноса атрибутов выбранных категорий по соответствию полигонов
+# Возвращает количество перенесенных атрибутов
+def transfer_attributes(obj_from, obj_to, face_mapping, categories):
+    src_mesh = obj_from.data
+    tgt_mesh = obj_to.data
+
+    selected = []
+    for attr in src_mesh.attributes:
+        if attr.name.startswith(".") or attr.name in SKIPPED_ATTRIBUTES:
+            continue
+        if attr.data_type not in ATTRIBUTE_ARRAY_FORMATS or attr.domain not in {'POINT', 'EDGE', 'FACE', 'CORNER'}:
+            continue
+        if get_attribute_category(src_mesh, attr) in categories:
+            selected.append((attr.name, attr.domain, attr.data_type, read_attribute(attr)))
+
+    if not selected:
+        return 0
+
+    # Соответствие доменов строится один раз для всех атрибутов пары
+    mappings = build_domain_mappings(obj_from, obj_to, face_mapping)
+
+    for name, domain, data_type, src_values in selected:
+        tgt_attr = tgt_mesh.attributes.get(name)
+        if tgt_attr and (tgt_attr.domain != domain or tgt_attr.data_type != data_type):
+            tgt_mesh.attributes.remove(tgt_attr)
+            tgt_attr = None
+        if tgt_attr is None:
+            tgt_attr = tgt_mesh.attributes.new(name=name, type=data_type, domain=domain)
+
+        # Элементы без соответствия сохраняют текущие значения цели
+        mapping = mappings[domain]
+        values = read_attribute(tgt_attr)
+        matched = mapping >= 0
+        values[matched] = src_values[mapping[matched]]
+        write_attribute(tgt_attr, values)
+
+    tgt_mesh.update()
+    return len(selected)
+
+
+# Функция для построения таблицы переназначения слотов источника в слоты цели
+# Существующие слоты цели сохраняются, недостающие материалы добавляются в конец
+def build_slot_remap(source_materials, target_materials):
+    target_slots = {}
+    for i, mat in enumerate(target_materials):
+        target_slots.setdefault(mat.name if mat else None, i)
+
+    remap = np.zeros(max(len(source_materials), 1), dtype=np.int32)
+    for i, mat in enumerate(source_materials):
+        key = mat.name if mat else None
+        if key not in target_slots:
+            target_materials.append(mat)
+            target_slots[key] = len(target_materials) - 1
+        remap[i] = target_slots[key]
+    return remap
+
+
+# Функция для переноса материалов по готовому соответствию полигонов
+# Возвращает количество полигонов цели без соответствия
+def apply_material_transfer(obj_from, obj_to, source_indices, mapping, keep_slots=False):
+    matched = mapping >= 0
+
+    if keep_slots:
+        # Слоты цели не трогаем, индексы переводим через таблицу за один проход
+        remap = build_slot_remap(obj_from.data.materials, obj_to.data.materials)
+        material_indices = read_material_indices(obj_to.data)
+        source_slots = np.clip(source_indices[mapping[matched]], 0, len(remap) - 1)
+        material_indices[matched] = remap[source_slots]
+    else:
+        material_indices = gather_by_mapping(source_indices, mapping)
+
+        obj_to.data.materials.clear()
+
+        names = set()
+        for mat in obj_from.data.materials:
+            if mat.name not in names:
+                names.add(mat.name)
+                obj_to.data.materials.append(mat)
+
+    # Записываем индексы в цель одним вызовом
+    write_material_indices(obj_to.data, material_indices)
+    return int(np.count_nonzero(~matched))
 
 
 # Операция для переноса материалов
@@ -35,26 +446,127 @@ class OBJECT_OT_my_button(bpy.types.Operator):
 
         bpy.ops.object.mode_set(mode='OBJECT')
 
-        material_indices = {}
+        scene = context.scene
+        mapping = compute_face_mapping(obj_1, obj_2, scene.transfer_mode, scene.transfer_max_distance,
+                                       scene.transfer_uv_channel, scene.transfer_uv_tolerance)
+        if mapping is None:
+            if scene.transfer_mode == 'UV':
+                self.report({'WARNING'}, f"У обоих объектов должен быть UV-канал {scene.transfer_uv_channel}!")
+            else:
+                self.report({'WARNING'}, "Оба объекта должны иметь одинаковое количество полигонов!")
+            return {'CANCELLED'}
+
+        # Читаем индексы материалов источника одним массивом
+        unmatched = apply_material_transfer(obj_1, obj_2, read_material_indices(obj_1.data), mapping,
+                                            scene.transfer_keep_slots)
+
+        # Атрибуты переносятся по тому же соответствию полигонов
+        transfer_attributes(obj_1, obj_2, mapping, scene.transfer_attribute_types)
 
-        for poly in obj_1.data.polygons:
-            material_indices[poly.index] = poly.material_index
+        if unmatched:
+            self.report({'WARNING'}, f"Материалы перенесены. Полигонов без соответствия: {unmatched}.")
+            return {'FINISHED'}
 
-        if len(obj_1.data.polygons) != len(obj_2.data.polygons):
-            self.report({'WARNING'}, "Оба объекта должны иметь одинаковое количество полигонов!")
+        self.report({'INFO'}, "Материалы успешно перенесены!")
+        return {'FINISHED'}
+
+
+# Операция для переноса атрибутов (UV, Color Attributes, sharp-флаги, пользовательские атрибуты)
+class OBJECT_OT_transfer_attributes(bpy.types.Operator):
+    bl_idname = "object.transfer_attributes"
+    bl_label = "Transfer Attributes"
+    bl_description = "Transfer selected attribute types from the source to the target object"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        scene = context.scene
+        obj_1 = scene.obj_from
+        obj_2 = scene.obj_to
+
+        if not obj_1 or not obj_2:
+            self.report({'WARNING'}, "Выберите оба объекта!")
             return {'CANCELLED'}
 
-        obj_2.data.materials.clear()
+        if obj_1.type != 'MESH' or obj_2.type != 'MESH':
+            self.report({'WARNING'}, "Оба объекта должны быть мешами!")
+            return {'CANCELLED'}
 
-        for mat in obj_1.data.materials:
-            if mat.name not in [m.name for m in obj_2.data.materials]:
-                obj_2.data.materials.append(mat)
+        if not scene.transfer_attribute_types:
+            self.report({'WARNING'}, "Выберите типы атрибутов для переноса!")
+            return {'CANCELLED'}
 
-        for poly in obj_2.data.polygons:
-            material_index = material_indices.get(poly.index, 0)
-            poly.material_index = material_index
+        bpy.ops.object.mode_set(mode='OBJECT')
 
-        self.report({'INFO'}, "Материалы успешно перенесены!")
+        mapping = compute_face_mapping(obj_1, obj_2, scene.transfer_mode, scene.transfer_max_distance,
+                                       scene.transfer_uv_channel, scene.transfer_uv_tolerance)
+        if mapping is None:
+            self.report({'WARNING'}, "Не удалось сопоставить полигоны объектов!")
+            return {'CANCELLED'}
+
+        count = transfer_attributes(obj_1, obj_2, mapping, scene.transfer_attribute_types)
+        self.report({'INFO'}, f"Перенесено атрибутов: {count}.")
+        return {'FINISHED'}
+
+
+# Операция для пакетного переноса материалов по правилам именования
+# Для каждого выделенного меша X ищутся цели по шаблонам, например X_LOD1 и UCX_X
+class OBJECT_OT_batch_transfer_materials(bpy.types.Operator):
+    bl_idname = "object.batch_transfer_materials"
+    bl_label = "Batch Transfer Materials"
+    bl_description = "Transfer materials from selected objects to objects named by the target patterns"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        scene = context.scene
+        patterns = [p.strip() for p in scene.batch_target_patterns.split(",") if "{name}" in p]
+        if not patterns:
+            self.report({'WARNING'}, "Шаблоны целей должны содержать {name}!")
+            return {'CANCELLED'}
+
+        sources = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not sources:
+            self.report({'WARNING'}, "Нет выбранных мешей!")
+            return {'CANCELLED'}
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        pair_count = 0
+        skipped = []
+        unmatched = 0
+
+        for source in sources:
+            targets = []
+            for pattern in patterns:
+                target = bpy.data.objects.get(pattern.replace("{name}", source.name))
+                if target and target.type == 'MESH' and target != source:
+                    targets.append(target)
+            if not targets:
+                continue
+
+            # Индексы материалов источника читаются один раз для всех его целей
+            source_indices = read_material_indices(source.data)
+
+            for target in targets:
+                mapping = compute_face_mapping(source, target, scene.transfer_mode, scene.transfer_max_distance,
+                                               scene.transfer_uv_channel, scene.transfer_uv_tolerance)
+                if mapping is None:
+                    skipped.append(target.name)
+                    continue
+                unmatched += apply_material_transfer(source, target, source_indices, mapping,
+                                                     scene.transfer_keep_slots)
+                transfer_attributes(source, target, mapping, scene.transfer_attribute_types)
+                pair_count += 1
+
+        if skipped:
+            print(f"Пропущены цели без соответствия полигонов: {', '.join(skipped)}")
+
+        if pair_count == 0:
+            self.report({'WARNING'}, "Не найдено ни одной пары для переноса материалов.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Материалы перенесены для {pair_count} пар. Пропущено: {len(skipped)}. "
+                              f"Полигонов без соответствия: {unmatched}.")
         return {'FINISHED'}
 
 
@@ -71,12 +583,11 @@ class OBJECT_OT_rename_uv(bpy.types.Operator):
             return {'CANCELLED'}
 
         renamed_count = 0
+        groups = group_objects_by_mesh(selected_objects)
 
-        for obj in selected_objects:
-            if obj.type != 'MESH':
-                continue
-
-            uv_layers = obj.data.uv_layers
+        for mesh, objs in groups.items():
+            obj = objs[0]
+            uv_layers = mesh.uv_layers
 
             if len(uv_layers) == 0:
                 self.report({'WARNING'}, f"У объекта {obj.name} нет UV-каналов!")
@@ -88,7 +599,7 @@ class OBJECT_OT_rename_uv(bpy.types.Operator):
             renamed_count += len(uv_layers)
 
         if renamed_count > 0:
-            self.report({'INFO'}, f"Переименовано {renamed_count} UV-каналов для выбранных объектов.")
+            self.report({'INFO'}, f"Переименовано {renamed_count} UV-каналов ({format_mesh_counts(groups)}).")
         else:
             self.report({'WARNING'}, "Ни у одного из выбранных объектов нет UV-каналов.")
 
@@ -108,12 +619,11 @@ class OBJECT_OT_rename_vc(bpy.types.Operator):
             return {'CANCELLED'}
 
         renamed_count = 0
+        groups = group_objects_by_mesh(selected_objects)
 
-        for obj in selected_objects:
-            if obj.type != 'MESH':
-                continue
-
-            color_attributes = obj.data.color_attributes
+        for mesh, objs in groups.items():
+            obj = objs[0]
+            color_attributes = mesh.color_attributes
 
             if len(color_attributes) == 0:
                 self.report({'WARNING'}, f"У объекта {obj.name} нет Color Attributes!")
@@ -126,13 +636,176 @@ class OBJECT_OT_rename_vc(bpy.types.Operator):
             renamed_count += len(color_attributes)
 
         if renamed_count > 0:
-            self.report({'INFO'}, f"Переименовано {renamed_count} Color Attributes для выбранных объектов.")
+            self.report({'INFO'}, f"Переименовано {renamed_count} Color Attributes ({format_mesh_counts(groups)}).")
         else:
             self.report({'WARNING'}, "Ни у одного из выбранных объектов нет Color Attributes.")
 
         return {'FINISHED'}
 
 
+# Функция для подсчета количества полигонов на каждом слоте материала одним проходом по массиву
+# Возвращает (индексы материалов полигонов, количество полигонов на слот)
+def get_material_slot_usage(mesh):
+    slot_count = max(len(mesh.materials), 1)
+    indices = np.clip(read_material_indices(mesh), 0, slot_count - 1)
+    return indices, np.bincount(indices, minlength=slot_count)
+
+
+# Функция для удаления неиспользуемых слотов материалов с уплотнением индексов полигонов
+# Используемые слоты находятся подсчетом индексов одним проходом по массиву
+def remove_unused_material_slots(mesh, usage=None):
+    if len(mesh.materials) == 0:
+        return 0
+
+    indices, counts = usage if usage is not None else get_material_slot_usage(mesh)
+    used = counts > 0
+    if used.all():
+        return 0
+
+    # Таблица новых индексов: каждый используемый слот сдвигается на число удаленных перед ним
+    remap = np.cumsum(used) - 1
+    for i in reversed(np.nonzero(~used)[0].tolist()):
+        mesh.materials.pop(index=i)
+
+    write_material_indices(mesh, remap[indices])
+    return int(np.count_nonzero(~used))
+
+
+# Функция для построения индекса использования материалов по всем мешам файла
+# Возвращает (использование слотов по мешам, количество полигонов по материалам)
+def build_material_usage_index():
+    mesh_usage = {}
+    material_faces = {}
+
+    for mesh in bpy.data.meshes:
+        if mesh.library or len(mesh.materials) == 0:
+            continue
+
+        usage = get_material_slot_usage(mesh)
+        mesh_usage[mesh] = usage
+        for mat, face_count in zip(mesh.materials, usage[1].tolist()):
+            if mat is not None:
+                material_faces[mat] = material_faces.get(mat, 0) + face_count
+
+    return mesh_usage, material_faces
+
+
+# Оператор для удаления неиспользуемых слотов и материалов во всем файле
+class OBJECT_OT_purge_unused_materials(bpy.types.Operator):
+    bl_idname = "object.purge_unused_materials"
+    bl_label = "Purge Unused Materials"
+    bl_description = "Remove empty material slots from all meshes and delete materials without users"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    report_only: bpy.props.BoolProperty(
+        name="Report Only",
+        description="Print material face counts without removing anything",
+        default=False,
+    )
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh_usage, material_faces = build_material_usage_index()
+
+        if self.report_only:
+            for mat, face_count in sorted(material_faces.items(), key=lambda item: item[1], reverse=True):
+                print(f"{mat.name}: {face_count} полигонов")
+            unused = [mat for mat in bpy.data.materials if material_faces.get(mat, 0) == 0]
+            self.report({'INFO'}, f"Материалов в мешах: {len(material_faces)}, без полигонов: {len(unused)}.")
+            return {'FINISHED'}
+
+        removed_slots = 0
+        for mesh, usage in mesh_usage.items():
+            removed_slots += remove_unused_material_slots(mesh, usage)
+
+        # Удаляем все материалы без пользователей одним вызовом
+        orphans = [mat for mat in bpy.data.materials if mat.users == 0 and not mat.library]
+        bpy.data.batch_remove(orphans)
+
+        self.report({'INFO'}, f"Удалено слотов: {removed_slots}, удалено материалов: {len(orphans)}.")
+        return {'FINISHED'}
+
+
+# Суффикс дубликата материала, например '.001'
+DUPLICATE_SUFFIX_PATTERN = re.compile(r"\.\d{3,}$")
+
+
+# Функция для группировки дубликатов материалов по базовому имени
+# Возвращает словарь дубликат -> основной материал
+def find_duplicate_materials():
+    groups = {}
+    for mat in bpy.data.materials:
+        if not mat.library:
+            groups.setdefault(DUPLICATE_SUFFIX_PATTERN.sub("", mat.name), []).append(mat)
+
+    replacements = {}
+    for base_name, mats in groups.items():
+        if len(mats) < 2:
+            continue
+        # Основным считается материал с базовым именем, иначе с наименьшим суффиксом
+        mats.sort(key=lambda m: (m.name != base_name, m.name))
+        for duplicate in mats[1:]:
+            replacements[duplicate] = mats[0]
+    return replacements
+
+
+# Функция для схлопывания повторяющихся слотов материала на меше
+# Индексы полигонов переводятся через таблицу за один проход
+def collapse_duplicate_slots(mesh):
+    slots = list(mesh.materials)
+    if len(set(slots)) == len(slots):
+        return 0
+
+    unique_slots = []
+    positions = {}
+    remap = np.empty(len(slots), dtype=np.int32)
+    for i, mat in enumerate(slots):
+        if mat not in positions:
+            positions[mat] = len(unique_slots)
+            unique_slots.append(mat)
+        remap[i] = positions[mat]
+
+    indices = np.clip(read_material_indices(mesh), 0, len(slots) - 1)
+    mesh.materials.clear()
+    for mat in unique_slots:
+        mesh.materials.append(mat)
+    write_material_indices(mesh, remap[indices])
+    return len(slots) - len(unique_slots)
+
+
+# Оператор для объединения дубликатов материалов (.001, .002 и т.д.)
+class OBJECT_OT_merge_duplicate_materials(bpy.types.Operator):
+    bl_idname = "object.merge_duplicate_materials"
+    bl_label = "Merge Duplicate Materials"
+    bl_description = "Replace .001-style duplicate materials with the base material in the whole file"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        replacements = find_duplicate_materials()
+        if not replacements:
+            self.report({'INFO'}, "Дубликаты материалов не найдены.")
+            return {'FINISHED'}
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        # Все ссылки на дубликат (слоты мешей и объектов, ноды) переводятся на основной материал
+        for duplicate, original in replacements.items():
+            duplicate.user_remap(original)
+
+        collapsed_slots = 0
+        for mesh in bpy.data.meshes:
+            if not mesh.library:
+                collapsed_slots += collapse_duplicate_slots(mesh)
+
+        bpy.data.batch_remove([mat for mat in replacements if mat.users == 0])
+
+        self.report({'INFO'}, f"Объединено материалов: {len(replacements)}, схлопнуто слотов: {collapsed_slots}.")
+        return {'FINISHED'}
+
+
 # Операция для очистки объекта от UV, Vertex Color, sharp_edge, sharp_face и неиспользованных материалов для всех выбранных объектов
 class OBJECT_OT_clean_collision(bpy.types.Operator):
     bl_idname = "object.clean_collision"
@@ -145,84 +818,365 @@ class OBJECT_OT_clean_collision(bpy.types.Operator):
             self.report({'WARNING'}, "Нет выбранных объектов!")
             return {'CANCELLED'}
 
-        for obj in selected_objects:
-            if obj.type != 'MESH':
-                continue
-
-            # Удаление всех UV-каналов
-            uv_layers = obj.data.uv_layers
-            while uv_layers:
-                uv_layers.remove(uv_layers[0])
+        groups = group_objects_by_mesh(selected_objects)
 
-            # Удаление всех Vertex Colors
-            color_attributes = obj.data.color_attributes
-            while color_attributes:
-                color_attributes.remove(color_attributes[0])
+        for mesh, objs in groups.items():
+            obj = objs[0]
 
-            # Удаление атрибутов sharp_edge и sharp_face, если они существуют
-            if "sharp_edge" in obj.data.attributes:
-                obj.data.attributes.remove(obj.data.attributes["sharp_edge"])
-
-            if "sharp_face" in obj.data.attributes:
-                obj.data.attributes.remove(obj.data.attributes["sharp_face"])
+            # Удаление всех UV-каналов, Vertex Colors и атрибутов sharp_edge и sharp_face за один проход
+            # Имена собираются заранее, чтобы не обращаться к коллекциям после каждого удаления
+            names = [layer.name for layer in mesh.uv_layers]
+            names += [attr.name for attr in mesh.color_attributes]
+            names += ["sharp_edge", "sharp_face"]
+            attributes = mesh.attributes
+            for name in names:
+                attr = attributes.get(name)
+                if attr:
+                    attributes.remove(attr)
 
             # Удаление неиспользуемых материалов
-            obj.data.use_fake_user = False  # Убираем фейковое использование материалов
-            used_materials = set(poly.material_index for poly in obj.data.polygons)
-
-            for i in reversed(range(len(obj.data.materials))):
-                if i not in used_materials:
-                    obj.data.materials.pop(index=i)
+            mesh.use_fake_user = False  # Убираем фейковое использование материалов
+            remove_unused_material_slots(mesh)
 
             # Проверка на количество оставшихся материалов
             if len(obj.data.materials) > 1:
                 self.report({'INFO'}, f"На объекте {obj.name} осталось больше одного материала.")
 
-        self.report({'INFO'}, "Все выбранные объекты успешно очищены.")
+        self.report({'INFO'}, f"Все выбранные объекты успешно очищены ({format_mesh_counts(groups)}).")
         return {'FINISHED'}
 
 
+# Порог угла треугольника, после которого он считается длинным
+LONG_TRIANGLE_ANGLE = math.radians(140)
+
+
+# Функция для чтения геометрии меша в массивы: вершины, углы полигонов и нормали
+def read_mesh_arrays(mesh):
+    loop_starts, loop_totals = get_loop_ranges(mesh)
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+    return {
+        "coords": coords.reshape(-1, 3),
+        "loop_verts": loop_verts,
+        "loop_starts": loop_starts,
+        "loop_totals": loop_totals,
+        "normals": normals.reshape(-1, 3),
+    }
+
+
+# Функция для получения координат вершин всех полигонов-треугольников одним массивом
+# Возвращает (индексы треугольников, координаты формы (n, 3, 3))
+def get_triangle_coords(arrays):
+    triangles = np.nonzero(arrays["loop_totals"] == 3)[0]
+    corners = arrays["loop_starts"][triangles, None] + np.arange(3)
+    return triangles, arrays["coords"][arrays["loop_verts"][corners]]
+
+
+# Функция для вычисления трех углов каждого треугольника (в радианах)
+def compute_triangle_angles(tri_coords):
+    prev_edges = np.roll(tri_coords, 1, axis=1) - tri_coords
+    next_edges = np.roll(tri_coords, -1, axis=1) - tri_coords
+    cross = np.linalg.norm(np.cross(prev_edges, next_edges), axis=2)
+    dot = (prev_edges * next_edges).sum(axis=2)
+    return np.arctan2(cross, dot)
+
+
+# Функция для поиска длинных треугольников: маска полигонов с углом больше порога
+def find_long_triangles(mesh, angle_threshold=LONG_TRIANGLE_ANGLE, arrays=None):
+    arrays = arrays or read_mesh_arrays(mesh)
+    mask = np.zeros(len(arrays["loop_starts"]), dtype=bool)
+    triangles, tri_coords = get_triangle_coords(arrays)
+    if len(triangles):
+        mask[triangles] = (compute_triangle_angles(tri_coords) > angle_threshold).any(axis=1)
+    return mask
+
+
+# Функция для записи выделения полигонов вместе с их вершинами и ребрами
+def write_face_selection(mesh, face_mask):
+    _loop_starts, loop_totals = get_loop_ranges(mesh)
+    loop_mask = np.repeat(face_mask, loop_totals)
+
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+
+    vert_mask = np.zeros(len(mesh.vertices), dtype=bool)
+    edge_mask = np.zeros(len(mesh.edges), dtype=bool)
+    vert_mask[loop_verts[loop_mask]] = True
+    edge_mask[loop_edges[loop_mask]] = True
+
+    mesh.vertices.foreach_set("select", vert_mask)
+    mesh.edges.foreach_set("select", edge_mask)
+    mesh.polygons.foreach_set("select", np.ascontiguousarray(face_mask, dtype=bool))
+    mesh.update()
+
+
 # Оператор для Long Triangles
+# Работает со всеми выделенными мешами в Object и Edit Mode
 class OBJECT_OT_long_triangles(bpy.types.Operator):
     bl_idname = "object.long_triangles"
     bl_label = "Long Triangles"
 
     def execute(self, context):
-        obj = context.active_object
-        if obj is None or obj.type != 'MESH':
+        objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not objects and context.active_object and context.active_object.type == 'MESH':
+            objects = [context.active_object]
+        if not objects:
             self.report({'WARNING'}, "Выберите объект типа MESH.")
             return {'CANCELLED'}
 
-        if context.mode != 'EDIT_MESH':
-            self.report({'WARNING'}, "Перейдите в режим редактирования.")
+        # Выход из Edit Mode записывает правки в меши, выделение пишется напрямую в меши
+        was_edit = context.mode == 'EDIT_MESH'
+        if was_edit:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        groups = group_objects_by_mesh(objects)
+        found = 0
+        unmapped = 0
+        for mesh, objs in groups.items():
+            mask, mesh_unmapped = get_long_triangle_mask(context, objs[0], mesh)
+            write_face_selection(mesh, mask)
+            found += int(np.count_nonzero(mask))
+            unmapped += mesh_unmapped
+
+        if was_edit:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+        message = f"Выделено треугольников с большими углами: {found} ({format_mesh_counts(groups)})."
+        if unmapped:
+            message += f" Не сопоставлено с исходными полигонами: {unmapped}."
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+
+# Функция для исправления длинных треугольников поворотом ребер (beauty fill)
+# Обрабатываются только отмеченные треугольники и их соседи, за одну bmesh-сессию на меш
+# angle_limit - максимальный угол между нормалями соседних треугольников (в радианах),
+# чтобы поворот ребра не менял форму неплоской поверхности
+def repair_long_triangles(mesh, face_mask, angle_limit):
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.faces.ensure_lookup_table()
+
+    flagged = [bm.faces[i] for i in np.nonzero(face_mask)[0].tolist()]
+    region = set(flagged)
+    for face in flagged:
+        for edge in face.edges:
+            region.update(edge.link_faces)
+    region = {face for face in region if len(face.verts) == 3}
+
+    # Поворачиваются только внутренние ребра между почти компланарными треугольниками
+    # с одним материалом; швы UV и острые ребра не трогаются, чтобы сохранить UV и шейдинг
+    edges = set()
+    for face in flagged:
+        for edge in face.edges:
+            link_faces = edge.link_faces
+            if len(link_faces) != 2 or not all(f in region for f in link_faces):
+                continue
+            if link_faces[0].material_index != link_faces[1].material_index:
+                continue
+            if edge.seam or not edge.smooth:
+                continue
+            if edge.calc_face_angle(math.pi) <= angle_limit:
+                edges.add(edge)
+
+    if edges:
+        bmesh.ops.beautify_fill(bm, faces=list(region), edges=list(edges), method='ANGLE')
+        bm.to_mesh(mesh)
+        mesh.update()
+
+    bm.free()
+
+
+# Оператор для исправления длинных треугольников на всех выделенных мешах
+class OBJECT_OT_repair_long_triangles(bpy.types.Operator):
+    bl_idname = "object.repair_long_triangles"
+    bl_label = "Repair Long Triangles"
+    bl_description = "Flip edges around long triangles of selected meshes to improve their angles"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    angle_limit: bpy.props.FloatProperty(
+        name="Max Angle", default=5.0, min=0.0, max=180.0,
+        description="Only flip edges between triangles whose normals differ by less than this angle",
+    )
+
+    def execute(self, context):
+        groups = group_objects_by_mesh(context.selected_objects)
+        if not groups:
+            self.report({'WARNING'}, "Нет выбранных мешей!")
             return {'CANCELLED'}
 
-        angle_threshold = math.radians(140)
-        bm = bmesh.from_edit_mesh(obj.data)
-        bpy.ops.mesh.select_all(action='DESELECT')
+        was_edit = context.mode == 'EDIT_MESH'
+        if was_edit:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        before = 0
+        after = 0
+        for mesh in groups:
+            mask = find_long_triangles(mesh)
+            count = int(np.count_nonzero(mask))
+            before += count
+            if count == 0:
+                continue
+
+            repair_long_triangles(mesh, mask, math.radians(self.angle_limit))
+
+            # Оставшиеся длинные треугольники выделяются для ручной правки
+            mask = find_long_triangles(mesh)
+            write_face_selection(mesh, mask)
+            after += int(np.count_nonzero(mask))
+
+        if was_edit:
+            bpy.ops.object.mode_set(mode='EDIT')
 
-        for face in bm.faces:
-            if len(face.verts) == 3:
-                verts = face.verts
-                edges = face.edges
+        self.report({'INFO'}, f"Длинных треугольников: было {before}, стало {after} ({format_mesh_counts(groups)}).")
+        return {'FINISHED'}
 
-                # Вычисляем углы между вершинами
-                angles = []
-                for i in range(3):
-                    v1 = verts[i].co
-                    v2 = verts[(i + 1) % 3].co
-                    v3 = verts[(i + 2) % 3].co
 
-                    vec1 = (v1 - v2).normalized()
-                    vec2 = (v3 - v2).normalized()
-                    angle = vec1.angle(vec2)
-                    angles.append(angle)
+# Имена атрибутов полигонов для метрик качества сетки
+QUALITY_ATTRIBUTES = {
+    "aspect_ratio": "quality_aspect_ratio",
+    "min_angle": "quality_min_angle",
+    "max_angle": "quality_max_angle",
+    "area": "quality_area",
+    "min_edge": "quality_min_edge",
+}
 
-                if any(angle > angle_threshold for angle in angles):
-                    face.select = True
+# Границы интервалов гистограмм
+ASPECT_RATIO_BINS = [1.0, 1.5, 2.0, 4.0, 8.0, 16.0, np.inf]
+MIN_ANGLE_BINS = [0.0, 1.0, 5.0, 10.0, 20.0, 30.0, 60.0, 90.0, 180.0]
+
+# Верхняя граница соотношения сторон для вырожденных полигонов с нулевой площадью
+MAX_ASPECT_RATIO = 1e6
+
+
+# Функция для вычисления метрик качества всех полигонов меша одним проходом по массивам
+# Углы в градусах; соотношение сторон 1 - у правильного многоугольника с тем же числом вершин
+def compute_face_quality(mesh):
+    loop_starts, loop_totals = get_loop_ranges(mesh)
+    loop_count = len(mesh.loops)
+    if len(loop_starts) == 0:
+        empty = np.empty(0, dtype=np.float32)
+        return {key: empty for key in QUALITY_ATTRIBUTES}
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    loop_verts = np.empty(loop_count, dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    areas = np.empty(len(mesh.polygons), dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+
+    # Предыдущий и следующий угол полигона для каждого угла
+    loop_faces = np.repeat(np.arange(len(loop_totals)), loop_totals)
+    offsets = np.arange(loop_count) - loop_starts[loop_faces]
+    next_loops = loop_starts[loop_faces] + (offsets + 1) % loop_totals[loop_faces]
+    prev_loops = loop_starts[loop_faces] + (offsets - 1) % loop_totals[loop_faces]
+
+    points = coords.reshape(-1, 3)[loop_verts]
+    next_edges = points[next_loops] - points
+    prev_edges = points[prev_loops] - points
+
+    cross = np.linalg.norm(np.cross(prev_edges, next_edges), axis=1)
+    corner_angles = np.degrees(np.arctan2(cross, (prev_edges * next_edges).sum(axis=1)))
+    edge_lengths = np.linalg.norm(next_edges, axis=1)
+
+    min_edge = np.minimum.reduceat(edge_lengths, loop_starts)
+    max_edge = np.maximum.reduceat(edge_lengths, loop_starts)
+
+    # Квадрат длинной стороны к площади, нормированный на правильный n-угольник:
+    # у него площадь n * a^2 / (4 * tan(pi / n)), поэтому квадрат и равносторонний треугольник дают 1
+    aspect_ratio = np.full(len(areas), MAX_ASPECT_RATIO, dtype=np.float32)
+    valid = areas > 0.0
+    sides = loop_totals[valid]
+    regular_ratio = 4.0 * np.tan(np.pi / sides) / sides
+    aspect_ratio[valid] = np.clip(max_edge[valid] ** 2 / areas[valid] / regular_ratio, 1.0, MAX_ASPECT_RATIO)
+
+    return {
+        "aspect_ratio": aspect_ratio,
+        "min_angle": np.minimum.reduceat(corner_angles, loop_starts),
+        "max_angle": np.maximum.reduceat(corner_angles, loop_starts),
+        "area": areas,
+        "min_edge": min_edge,
+    }
+
+
+# Функция для записи метрик качества в атрибуты полигонов (для просмотра во вьюпорте)
+def write_face_quality_attributes(mesh, quality):
+    for key, attr_name in QUALITY_ATTRIBUTES.items():
+        attr = mesh.attributes.get(attr_name)
+        if attr and (attr.domain != 'FACE' or attr.data_type != 'FLOAT'):
+            mesh.attributes.remove(attr)
+            attr = None
+        if attr is None:
+            attr = mesh.attributes.new(name=attr_name, type='FLOAT', domain='FACE')
+        write_attribute(attr, quality[key])
+
+
+# Функция для печати текстовой гистограммы
+def print_histogram(title, values, bins):
+    counts, edges = np.histogram(values, bins=bins)
+    print(f"  {title}:")
+    for count, low, high in zip(counts.tolist(), edges[:-1], edges[1:]):
+        print(f"    {low:>6g} - {high:<6g}: {count}")
+
+
+# Оператор для анализа качества сетки всех выделенных мешей
+class OBJECT_OT_mesh_quality(bpy.types.Operator):
+    bl_idname = "object.mesh_quality"
+    bl_label = "Mesh Quality"
+    bl_description = "Compute aspect ratio, angles, area and shortest edge of every face of selected meshes"
+    bl_options = {'REGISTER', 'UNDO'}
 
-        bmesh.update_edit_mesh(obj.data)
-        self.report({'INFO'}, "Выделены треугольники с большими углами.")
+    write_attributes: bpy.props.BoolProperty(
+        name="Write Attributes",
+        description="Store metrics as face attributes for viewport inspection",
+        default=True,
+    )
+    sliver_angle: bpy.props.FloatProperty(
+        name="Sliver Angle", default=5.0, min=0.0, max=60.0,
+        description="Faces with a smaller minimum angle are counted as slivers",
+    )
+    micro_area: bpy.props.FloatProperty(
+        name="Micro Area", default=0.0001, min=0.0, precision=6,
+        description="Faces with a smaller area are counted as micro faces",
+    )
+
+    def execute(self, context):
+        groups = group_objects_by_mesh(context.selected_objects)
+        if not groups:
+            self.report({'WARNING'}, "Нет выбранных мешей!")
+            return {'CANCELLED'}
+
+        was_edit = context.mode == 'EDIT_MESH'
+        if was_edit:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        slivers = 0
+        micro = 0
+        for mesh, objs in groups.items():
+            quality = compute_face_quality(mesh)
+            if self.write_attributes:
+                write_face_quality_attributes(mesh, quality)
+
+            mesh_slivers = int(np.count_nonzero(quality["min_angle"] < self.sliver_angle))
+            mesh_micro = int(np.count_nonzero(quality["area"] < self.micro_area))
+            slivers += mesh_slivers
+            micro += mesh_micro
+
+            print(f"{objs[0].name}: полигонов {len(mesh.polygons)}, "
+                  f"узких: {mesh_slivers}, микро: {mesh_micro}")
+            print_histogram("Aspect ratio", quality["aspect_ratio"], ASPECT_RATIO_BINS)
+            print_histogram("Min angle", quality["min_angle"], MIN_ANGLE_BINS)
+
+        if was_edit:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+        self.report({'INFO'}, f"Узких полигонов: {slivers}, микро-полигонов: {micro} ({format_mesh_counts(groups)}).")
         return {'FINISHED'}
 
 
@@ -239,11 +1193,12 @@ class OBJECT_OT_delete_materials(bpy.types.Operator):
             self.report({'WARNING'}, "No objects selected")
             return {'CANCELLED'}
 
-        for obj in selected_objects:
-            if obj.type == 'MESH':
-                obj.data.materials.clear()
+        groups = group_objects_by_mesh(selected_objects)
+        for mesh in groups:
+            mesh.materials.clear()
 
-        self.report({'INFO'}, "All materials removed from selected objects")
+        object_count = sum(len(objs) for objs in groups.values())
+        self.report({'INFO'}, f"All materials removed from {object_count} objects ({len(groups)} unique meshes)")
         return {'FINISHED'}
 
 
@@ -265,12 +1220,12 @@ bpy.types.Scene.texture_folder_path = bpy.props.StringProperty(
     subtype='DIR_PATH'
 )
 
-# Функция для вычисления UDIM на основе UV-координат
+# Функция для вычисления UDIM на основе UV-координат (массивом для всех полигонов)
 # UDIM - это система, используемая для текстурирования с использованием плиток
-def get_udim_from_uv(uv):
+def get_udim_from_uv(uvs):
     udim_base = 1001  # Базовый индекс UDIM
-    udim_x = int(uv.x)  # Координата X
-    udim_y = int(uv.y)  # Координата Y
+    udim_x = uvs[:, 0].astype(np.int64)  # Координата X
+    udim_y = uvs[:, 1].astype(np.int64)  # Координата Y
     return udim_base + udim_x + (udim_y * 10)
 
 
@@ -283,85 +1238,461 @@ def get_udim_from_texture_name(name):
     return None
 
 
-# Функция для получения цвета пикселя из текстуры на основе UV-координат
-def get_pixel_color(image, uv):
-    x = int(uv.x * image.size[0]) % image.size[0]  # Координата X пикселя
-    y = int(uv.y * image.size[1]) % image.size[1]  # Координата Y пикселя
-    pixel_index = (y * image.size[0] + x) * 4  # Индекс пикселя в массиве
-    return image.pixels[pixel_index:pixel_index + 3]  # Возвращаем только RGB
+# Функция для чтения пикселей изображения один раз в компактный массив RGB (uint8, строки снизу вверх)
+def read_image_pixels(image):
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    rgb = pixels.reshape(height, width, 4)[:, :, :3]
+    return (np.clip(rgb, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+# LRU-кэш пикселей текстур на время сессии: путь -> (mtime, размер файла, пиксели)
+texture_cache = OrderedDict()
+texture_cache_stats = {"hits": 0, "misses": 0, "bytes": 0}
+
+
+# Функция для получения пикселей текстуры из кэша
+# Запись действительна, пока у файла не изменились время изменения и размер
+def get_cached_texture(texture_path, stat):
+    cached = texture_cache.get(texture_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        texture_cache.move_to_end(texture_path)
+        texture_cache_stats["hits"] += 1
+        return cached[2]
+
+    texture_cache_stats["misses"] += 1
+    return None
+
+
+# Функция для сохранения пикселей текстуры в кэш с вытеснением давно не использованных
+def put_cached_texture(texture_path, stat, pixels, limit_bytes):
+    old = texture_cache.pop(texture_path, None)
+    if old:
+        texture_cache_stats["bytes"] -= old[2].nbytes
+
+    texture_cache[texture_path] = (stat.st_mtime_ns, stat.st_size, pixels)
+    texture_cache_stats["bytes"] += pixels.nbytes
+
+    # Последняя загруженная текстура остается в кэше всегда
+    while texture_cache_stats["bytes"] > limit_bytes and len(texture_cache) > 1:
+        _path, (_mtime, _size, evicted) = texture_cache.popitem(last=False)
+        texture_cache_stats["bytes"] -= evicted.nbytes
+
+
+# Функция для приведения декодированного изображения (строки сверху вниз) к формату read_image_pixels
+def to_blender_pixels(pixels):
+    if pixels.shape[2] < 3:
+        pixels = np.repeat(pixels[:, :, :1], 3, axis=2)
+    return np.ascontiguousarray(pixels[::-1, :, :3])
+
+
+# Функция для декодирования несжатого BMP (24 и 32 бита) в массив RGB
+def decode_bmp(data):
+    width, height = struct.unpack_from("<ii", data, 18)
+    bits, compression = struct.unpack_from("<HI", data, 28)
+    if bits not in (24, 32) or compression != 0:
+        return None
+
+    offset = struct.unpack_from("<I", data, 10)[0]
+    channels = bits // 8
+    row_size = (width * bits + 31) // 32 * 4
+    rows = np.frombuffer(data, dtype=np.uint8, count=row_size * abs(height), offset=offset)
+    pixels = rows.reshape(abs(height), row_size)[:, :width * channels].reshape(abs(height), width, channels)
+
+    # BMP хранит BGR и строки снизу вверх, как Blender; при отрицательной высоте - сверху вниз
+    pixels = pixels[:, :, 2::-1]
+    if height < 0:
+        pixels = pixels[::-1]
+    return np.ascontiguousarray(pixels)
+
+
+# Функция для декодирования 8-битного PNG без чересстрочности в массив RGB
+# Фильтры Average и Paeth последовательны внутри строки, такие файлы не декодируются
+def decode_png(data):
+    pos = 8
+    header = None
+    idat = []
+    while pos < len(data):
+        length = struct.unpack_from(">I", data, pos)[0]
+        chunk_type = data[pos + 4:pos + 8]
+        if chunk_type == b"IHDR":
+            header = struct.unpack_from(">IIBBBBB", data, pos + 8)
+        elif chunk_type == b"IDAT":
+            idat.append(data[pos + 8:pos + 8 + length])
+        elif chunk_type == b"IEND":
+            break
+        pos += length + 12
+
+    if header is None:
+        return None
+    width, height, depth, color_type, _compression, _filter, interlace = header
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+    if depth != 8 or interlace or channels is None:
+        return None
+
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8).reshape(height, width * channels + 1)
+    filters = raw[:, 0]
+    if (filters > 2).any():
+        return None
+
+    rows = raw[:, 1:].reshape(height, width, channels).copy()
+    # Sub: накопленная сумма слева направо по модулю 256
+    sub = filters == 1
+    rows[sub] = np.cumsum(rows[sub], axis=1, dtype=np.uint8)
+    # Up: прибавляем предыдущую строку, поэтому строки обрабатываются сверху вниз
+    for row in np.nonzero(filters == 2)[0].tolist():
+        if row > 0:
+            rows[row] += rows[row - 1]
+    return to_blender_pixels(rows)
+
+
+# Функция для декодирования файла текстуры без создания datablock в bpy.data.images
+# Вызывается из потоков; возвращает None, если формат не поддерживается или файл не прочитан
+def decode_texture_file(texture_path):
+    try:
+        return decode_texture_data(texture_path)
+    except (OSError, ValueError, struct.error, zlib.error) as error:
+        print(f"Не удалось декодировать {texture_path}: {error}")
+        return None
+
+
+# Известный тайл 2x2 для проверки OpenImageIO (строки снизу вверх, как в Blender):
+# снизу красный и зеленый, сверху синий и белый
+OIIO_CHECK_PIXELS = np.array([[[255, 0, 0], [0, 255, 0]], [[0, 0, 255], [255, 255, 255]]], dtype=np.uint8)
+
+# Результат проверки OpenImageIO: None - еще не проверялся
+oiio_state = {"usable": None}
+
+
+# Функция для чтения всех каналов изображения через OpenImageIO
+def read_oiio_pixels(texture_path):
+    image_input = oiio.ImageInput.open(texture_path)
+    if not image_input:
+        return None
+    try:
+        # Конец диапазона каналов указывается явно: при -1 читается только первый канал
+        pixels = image_input.read_image(0, 0, 0, image_input.spec().nchannels, "uint8")
+    finally:
+        image_input.close()
+    if pixels is None:
+        return None
+    return to_blender_pixels(pixels.reshape(pixels.shape[0], pixels.shape[1], -1))
+
+
+# Функция для проверки OpenImageIO на известном RGB-тайле (один раз за сессию)
+# Если каналы или порядок строк не совпадают, используются встроенные декодеры
+def is_oiio_usable():
+    if oiio_state["usable"] is None:
+        rows = b"".join(row[:, ::-1].tobytes() + b"\0\0" for row in OIIO_CHECK_PIXELS)
+        header = struct.pack("<2sIHHI", b"BM", 54 + len(rows), 0, 0, 54)
+        info = struct.pack("<IiiHHIIiiII", 40, 2, 2, 1, 24, 0, len(rows), 2835, 2835, 0, 0)
+        with tempfile.NamedTemporaryFile(suffix=".bmp", delete=False) as check_file:
+            check_file.write(header + info + rows)
+        try:
+            pixels = read_oiio_pixels(check_file.name)
+        except (OSError, RuntimeError, ValueError):
+            pixels = None
+        finally:
+            os.remove(check_file.name)
+        oiio_state["usable"] = pixels is not None and np.array_equal(pixels, OIIO_CHECK_PIXELS)
+        if not oiio_state["usable"]:
+            print("OpenImageIO вернул неверные пиксели проверочного тайла, используются встроенные декодеры")
+    return oiio_state["usable"]
+
+
+# Функция для декодирования файла текстуры через OpenImageIO или встроенные декодеры
+def decode_texture_data(texture_path):
+    if oiio is not None and is_oiio_usable():
+        pixels = read_oiio_pixels(texture_path)
+        if pixels is not None:
+            return pixels
+
+    with open(texture_path, "rb") as texture_file:
+        data = texture_file.read()
+    if data[:2] == b"BM":
+        return decode_bmp(data)
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return decode_png(data)
+    return None
+
+
+# Имя папки кэша декодированных текстур внутри папки текстур (если включено в сцене)
+DISK_CACHE_FOLDER = ".chillbase_cache"
+
+# Имя папки кэша в пользовательской папке данных Blender
+USER_CACHE_FOLDER = "chillbase_env_helper_cache"
+
+
+# Функция для получения корневой папки кэша в пользовательской папке данных Blender
+def get_user_cache_root():
+    return bpy.utils.user_resource('DATAFILES', path=USER_CACHE_FOLDER, create=True)
+
+
+# Функция для выбора папки дискового кэша для папки текстур
+# По умолчанию - отдельная подпапка в пользовательской папке данных Blender, чтобы кэш
+# не попадал в систему контроля версий; рядом с текстурами - только если это включено
+def get_disk_cache_dir(folder_path, in_folder=False):
+    if in_folder:
+        cache_dir = os.path.join(folder_path, DISK_CACHE_FOLDER)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            if os.access(cache_dir, os.W_OK):
+                return cache_dir
+        except OSError:
+            pass
+
+    folder_key = hashlib.sha1(os.path.abspath(folder_path).encode("utf-8")).hexdigest()[:16]
+    cache_dir = os.path.join(get_user_cache_root(), folder_key)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as error:
+        print(f"Не удалось создать папку кэша {cache_dir}: {error}")
+        return None
+    return cache_dir
+
+
+# Версия формата дискового кэша; увеличивается при изменении декодеров,
+# чтобы файлы, записанные прежними декодерами, не читались и удалялись
+DISK_CACHE_VERSION = 2
+
+# Хеши содержимого текстур: путь -> (mtime_ns, размер, хеш)
+texture_hashes = {}
+
+
+# Функция для вычисления хеша содержимого файла текстуры
+# Хеш пересчитывается только при изменении времени модификации или размера файла
+def hash_texture_file(texture_path):
+    stat = os.stat(texture_path)
+    entry = texture_hashes.get(texture_path)
+    if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        return entry[2]
+
+    digest = hashlib.sha1()
+    with open(texture_path, "rb") as texture_file:
+        for block in iter(lambda: texture_file.read(1 << 20), b""):
+            digest.update(block)
+    texture_hashes[texture_path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()
+
+
+# Функция для получения имени файла кэша: хеш текстуры и версия формата кэша
+def get_cache_file_name(texture_path):
+    return f"{hash_texture_file(texture_path)}_v{DISK_CACHE_VERSION}.npy"
+
+
+# Функция для удаления файлов кэша, не совпадающих ни с одной текущей текстурой папки
+# в текущей версии формата (файлы других версий удаляются всегда)
+# Возвращает количество удаленных файлов
+def prune_disk_cache(cache_dir, texture_paths):
+    keep = set()
+    for texture_path in texture_paths:
+        try:
+            keep.add(get_cache_file_name(texture_path))
+        except OSError:
+            continue
+
+    removed = 0
+    for file_name in os.listdir(cache_dir):
+        if file_name.endswith(".npy") and file_name not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, file_name))
+                removed += 1
+            except OSError as error:
+                print(f"Не удалось удалить кэш {file_name}: {error}")
+    return removed
+
+
+# Функция для удаления дискового кэша: вся пользовательская папка кэша
+# и папка кэша внутри указанной папки текстур. Возвращает количество удаленных файлов
+def clear_disk_cache(folder_path):
+    cache_dirs = [get_user_cache_root()]
+    if folder_path:
+        cache_dirs.append(os.path.join(folder_path, DISK_CACHE_FOLDER))
+
+    removed = 0
+    for cache_dir in cache_dirs:
+        for root, _dirs, files in os.walk(cache_dir):
+            for file_name in files:
+                if not file_name.endswith((".npy", ".tmp")):
+                    continue
+                try:
+                    os.remove(os.path.join(root, file_name))
+                    removed += 1
+                except OSError as error:
+                    print(f"Не удалось удалить кэш {file_name}: {error}")
+    return removed
+
+
+# Функция для сохранения пикселей в дисковый кэш (.npy) через временный файл
+def save_disk_cache(cache_file, pixels):
+    temp_file = f"{cache_file}.{os.getpid()}.{id(pixels)}.tmp"
+    try:
+        with open(temp_file, "wb") as output:
+            np.save(output, pixels)
+        os.replace(temp_file, cache_file)
+    except OSError as error:
+        print(f"Не удалось сохранить кэш {cache_file}: {error}")
+
+
+# Функция для получения пикселей текстуры из дискового кэша или декодированием
+# Файл кэша открывается через memory map, с диска читаются только нужные страницы
+# Возвращает (пиксели или None, путь к файлу кэша или None)
+def read_texture_source(texture_path, cache_dir):
+    cache_file = None
+    if cache_dir:
+        try:
+            cache_file = os.path.join(cache_dir, get_cache_file_name(texture_path))
+        except OSError:
+            return None, None
+        if os.path.exists(cache_file):
+            try:
+                return np.load(cache_file, mmap_mode='r'), cache_file
+            except (OSError, ValueError) as error:
+                print(f"Не удалось прочитать кэш {cache_file}: {error}")
+
+    pixels = decode_texture_file(texture_path)
+    if pixels is not None and cache_file:
+        save_disk_cache(cache_file, pixels)
+    return pixels, cache_file
+
+
+# Количество потоков для декодирования текстур
+TEXTURE_DECODE_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# Функция для загрузки пикселей набора текстур: из кэша в памяти, из дискового кэша,
+# параллельным декодированием или, для неподдерживаемых форматов, через bpy.data.images.load
+# Возвращает словарь путь -> пиксели
+def load_texture_pixels(texture_paths, limit_bytes, cache_dir=None):
+    result = {}
+    missing = []
+    for texture_path in texture_paths:
+        try:
+            stat = os.stat(texture_path)
+        except OSError:
+            print(f"Ошибка загрузки текстуры: {texture_path}")
+            continue
+        pixels = get_cached_texture(texture_path, stat)
+        if pixels is not None:
+            result[texture_path] = pixels
+        else:
+            missing.append((texture_path, stat))
+
+    with ThreadPoolExecutor(max_workers=TEXTURE_DECODE_WORKERS) as executor:
+        decoded = list(executor.map(lambda item: read_texture_source(item[0], cache_dir), missing))
+
+    for (texture_path, stat), (pixels, cache_file) in zip(missing, decoded):
+        if pixels is None:
+            try:
+                image = bpy.data.images.load(texture_path, check_existing=True)
+            except RuntimeError:
+                print(f"Ошибка загрузки текстуры: {texture_path}")
+                continue
+            if texture_path in texture_cache:
+                # Файл изменился на диске, изображение в Blender нужно перечитать
+                image.reload()
+            pixels = read_image_pixels(image)
+            if cache_file:
+                save_disk_cache(cache_file, pixels)
+        put_cached_texture(texture_path, stat, pixels, limit_bytes)
+        result[texture_path] = pixels
+
+    return result
+
+
+# Функция для очистки кэша текстур
+def clear_texture_cache():
+    texture_cache.clear()
+    texture_cache_stats.update(hits=0, misses=0, bytes=0)
+
+
+# Функция для получения цветов пикселей текстуры по массиву UV-координат
+def get_pixel_colors(pixels, uvs):
+    height, width = pixels.shape[:2]
+    x = (uvs[:, 0] * width).astype(np.int64) % width  # Координата X пикселя
+    y = (uvs[:, 1] * height).astype(np.int64) % height  # Координата Y пикселя
+    return pixels[y, x]
+
+
+# Порядок ключей материалов для классификации цвета
+MATERIAL_KEYS = ("red", "green", "blue", "default")
+
+
+# Функция для определения ключа материала по цвету (индекс в MATERIAL_KEYS)
+# Канал считается ярким, если он больше 0.5 (в uint8 - больше 127)
+def classify_colors(colors):
+    bright = colors > 127
+    red = bright[:, 0] & ~bright[:, 1] & ~bright[:, 2]
+    green = ~bright[:, 0] & bright[:, 1] & ~bright[:, 2]
+    blue = ~bright[:, 0] & ~bright[:, 1] & bright[:, 2]
+    return np.select([red, green, blue], [0, 1, 2], default=3)
 
 
 # Функция для назначения материалов на основе цвета текстуры
-def assign_materials_to_mesh(mesh_obj, images_by_udim, material_map):
-    bm = bmesh.new()
-    bm.from_mesh(mesh_obj.data)
+# pixels_by_udim - словарь UDIM -> массив пикселей из read_image_pixels
+def assign_materials_to_mesh(mesh_obj, pixels_by_udim, material_map):
+    mesh = mesh_obj.data
 
-    # Получаем второй UV-канал
-    uv_layer = bm.loops.layers.uv.get("UVChannel_2")
-    if not uv_layer:
+    # Получаем UV-центры полигонов по второму UV-каналу
+    center_uvs = get_face_uv_centers(mesh, "UVChannel_2")
+    if center_uvs is None:
         print(f"UVChannel_2 не найден на меше {mesh_obj.name}.")
-        bm.free()
         return
 
-    # Создаем словарь для быстрого доступа к индексам материалов
-    material_index_map = {key: mesh_obj.data.materials.find(mat.name) for key, mat in material_map.items()}
+    # Таблица ключ материала -> индекс слота
+    key_slots = np.array([mesh.materials.find(material_map[key].name) for key in MATERIAL_KEYS], dtype=np.int32)
+    for key, slot in zip(MATERIAL_KEYS, key_slots.tolist()):
+        if slot == -1:
+            print(f"Материал '{key}' не найден для объекта {mesh_obj.name}.")
 
-    # Обрабатываем каждый полигон
-    for face in bm.faces:
-        center_uv = Vector((0.0, 0.0))
-        for loop in face.loops:
-            center_uv += loop[uv_layer].uv
-        center_uv /= len(face.loops)
+    material_indices = read_material_indices(mesh)
+    udims = get_udim_from_uv(center_uvs)
 
-        udim = get_udim_from_uv(center_uv)
-        image = images_by_udim.get(udim)
+    # Обрабатываем полигоны группами по UDIM
+    for udim in np.unique(udims).tolist():
+        faces = np.nonzero(udims == udim)[0]
+        pixels = pixels_by_udim.get(udim)
 
-        if not image:
-            print(f"Текстура для UDIM {udim} не найдена. Пропуск полигона.")
+        if pixels is None:
+            print(f"Текстура для UDIM {udim} не найдена. Пропуск полигонов: {len(faces)}.")
             continue
 
-        # Получаем цвет пикселя
-        color = get_pixel_color(image, center_uv)
-        if color[0] > 0.5 and color[1] < 0.5 and color[2] < 0.5:
-            material_key = "red"
-        elif color[0] < 0.5 and color[1] > 0.5 and color[2] < 0.5:
-            material_key = "green"
-        elif color[0] < 0.5 and color[1] < 0.5 and color[2] > 0.5:
-            material_key = "blue"
-        else:
-            material_key = "default"
-
-        # Назначаем материал полигону
-        if material_index_map[material_key] != -1:
-            face.material_index = material_index_map[material_key]
-        else:
-            print(f"Материал '{material_key}' не найден для объекта {mesh_obj.name}.")
+        slots = key_slots[classify_colors(get_pixel_colors(pixels, center_uvs[faces]))]
+        found = slots != -1
+        material_indices[faces[found]] = slots[found]
 
-    bm.to_mesh(mesh_obj.data)
-    bm.free()
+    write_material_indices(mesh, material_indices)
 
 
 # Функция для назначения текстур на основе UDIM
 def assign_textures_to_meshes_from_folder(folder_path):
     if not os.path.exists(folder_path):
         print(f"Папка {folder_path} не найдена.")
-        return
+        return None
 
     texture_files = [f for f in os.listdir(folder_path) if f.lower().endswith(('.png', '.jpg', '.bmp'))]
-    images_by_udim = {}
+    limit_bytes = bpy.context.scene.texture_cache_limit * 1024 * 1024
+    paths_by_udim = {}
     for texture_file in texture_files:
         udim = get_udim_from_texture_name(texture_file)
         if udim:
-            texture_path = os.path.join(folder_path, texture_file)
-            try:
-                image = bpy.data.images.load(texture_path, check_existing=True)
-                images_by_udim[udim] = image
-            except RuntimeError:
-                print(f"Ошибка загрузки текстуры: {texture_path}")
-
-    for obj in bpy.context.selected_objects:
-        if obj.type != 'MESH':
-            continue
+            paths_by_udim[udim] = os.path.join(folder_path, texture_file)
+
+    pixels_by_udim = {}
+    cache_dir = None
+    if bpy.context.scene.texture_disk_cache:
+        cache_dir = get_disk_cache_dir(folder_path, bpy.context.scene.texture_disk_cache_in_folder)
+    pixels_by_path = load_texture_pixels(list(paths_by_udim.values()), limit_bytes, cache_dir)
+    if cache_dir:
+        prune_disk_cache(cache_dir, paths_by_udim.values())
+    for udim, texture_path in paths_by_udim.items():
+        if texture_path in pixels_by_path:
+            pixels_by_udim[udim] = pixels_by_path[texture_path]
+
+    groups = group_objects_by_mesh(bpy.context.selected_objects)
+    for objs in groups.values():
+        obj = objs[0]
 
         material_map = {}
         for key, mat_name in materials.items():
@@ -372,7 +1703,9 @@ def assign_textures_to_meshes_from_folder(folder_path):
                 obj.data.materials.append(mat)
             material_map[key] = mat
 
-        assign_materials_to_mesh(obj, images_by_udim, material_map)
+        assign_materials_to_mesh(obj, pixels_by_udim, material_map)
+
+    return groups
 
 
 # Функция для назначения материалов на основе альфа-канала
@@ -460,19 +1793,50 @@ class OBJECT_OT_AssignMaterialsByAlpha(bpy.types.Operator):
             self.report({'WARNING'}, "Нет выбранных объектов.")
             return {'CANCELLED'}
 
-        for obj in selected_objects:
-            assign_materials_based_on_alpha(obj)
+        groups = group_objects_by_mesh(selected_objects)
+        for objs in groups.values():
+            assign_materials_based_on_alpha(objs[0])
 
-        self.report({'INFO'}, f"Материалы назначены для {len(selected_objects)} объектов.")
+        self.report({'INFO'}, f"Материалы назначены ({format_mesh_counts(groups)}).")
         return {'FINISHED'}
 
 
+# Функция для получения матрицы перевода нормалей объекта в мир (нормали - строки, normals @ matrix)
+# Вместо обратной матрицы берется присоединенная (векторные произведения столбцов): она совпадает
+# с обратной с точностью до длины и существует при нулевом масштабе по оси (плоские декали, хелперы)
+def get_normal_matrix(obj):
+    matrix = np.array(obj.matrix_world, dtype=np.float64)[:3, :3]
+    adjugate = np.array([
+        np.cross(matrix[:, 1], matrix[:, 2]),
+        np.cross(matrix[:, 2], matrix[:, 0]),
+        np.cross(matrix[:, 0], matrix[:, 1]),
+    ])
+    # При отрицательном масштабе присоединенная матрица разворачивает нормали
+    return -adjugate if np.linalg.det(matrix) < 0.0 else adjugate
+
+
+# Функция для вычисления наклона всех полигонов объекта в мировых координатах (в градусах)
+# Нормали переводятся в мир одним матричным умножением с учетом поворота и масштаба объекта
+def compute_face_slopes(obj, mesh=None, normals=None):
+    if normals is None:
+        mesh = mesh or obj.data
+        normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("normal", normals)
+
+    world_normals = normals.reshape(-1, 3) @ get_normal_matrix(obj)
+    lengths = np.linalg.norm(world_normals, axis=1)
+    lengths[lengths == 0.0] = 1.0
+
+    return np.degrees(np.arccos(np.clip(world_normals[:, 2] / lengths, -1.0, 1.0)))
+
+
 # Оператор для выделения полигонов по углу
+# Выделение пишется напрямую в меши, без переключения режима для каждого объекта
 class CollisionAngleSelectorOperator(bpy.types.Operator):
     """Check collision slope angle"""
     bl_idname = "object.check_collision_slope_angle"
     bl_label = "Check Collision Slope Angle"
-    bl_description = "Objects must be in Edit Mode"  # Подсказка
+    bl_description = "Select faces of selected meshes steeper than the threshold angle in world space"  # Подсказка
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
@@ -481,31 +1845,785 @@ class CollisionAngleSelectorOperator(bpy.types.Operator):
             self.report({'WARNING'}, "No mesh objects selected!")
             return {'CANCELLED'}
 
-        for obj in selected_objects:
-            bpy.context.view_layer.objects.active = obj
+        # Получаем значение угла из UI
+        threshold_angle = context.scene.collision_threshold_angle_slider
+
+        was_edit = context.mode == 'EDIT_MESH'
+        if was_edit:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        # Для общих мешей используется матрица первого объекта группы
+        groups = group_objects_by_mesh(selected_objects)
+        selected_faces = 0
+        unmapped = 0
+        for mesh, objs in groups.items():
+            mask, mesh_unmapped = get_steep_face_mask(context, objs[0], mesh, threshold_angle)
+            write_face_selection(mesh, mask)
+            selected_faces += int(np.count_nonzero(mask))
+            unmapped += mesh_unmapped
+
+        if was_edit:
             bpy.ops.object.mode_set(mode='EDIT')
-            me = obj.data
-            bm = bmesh.from_edit_mesh(me)
 
-            # Очищаем текущее выделение
-            for f in bm.faces:
-                f.select = False
+        message = f"Selected {selected_faces} steep faces ({format_mesh_counts(groups)})."
+        if unmapped:
+            message += f" {unmapped} flagged modifier faces have no original face."
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+
+# Имя группы Geometry Nodes и атрибутов с результатами проверок
+CHECK_NODE_GROUP_NAME = "CBH_Checks"
+STEEP_ATTRIBUTE = "cbh_steep"
+LONG_TRIANGLE_ATTRIBUTE = "cbh_long_triangle"
+
+
+# Функция для получения активного сокета по имени
+# У нод с выбором типа данных несколько сокетов "Value", включен только сокет выбранного типа
+def enabled_socket(sockets, name):
+    return next(socket for socket in sockets if socket.name == name and socket.enabled)
+
+
+# Функция для создания группы Geometry Nodes, вычисляющей наклон полигонов и углы треугольников
+# Результаты пишутся в булевы атрибуты полигонов cbh_steep и cbh_long_triangle
+def get_check_node_group():
+    group = bpy.data.node_groups.get(CHECK_NODE_GROUP_NAME)
+    if group:
+        return group
+
+    group = bpy.data.node_groups.new(CHECK_NODE_GROUP_NAME, 'GeometryNodeTree')
+    interface = group.interface
+    interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    interface.new_socket("Up", in_out='INPUT', socket_type='NodeSocketVector')
+    interface.new_socket("Slope Angle", in_out='INPUT', socket_type='NodeSocketFloat')
+    interface.new_socket("Triangle Angle", in_out='INPUT', socket_type='NodeSocketFloat')
+    interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = group.nodes
+    links = group.links
+    group_in = nodes.new('NodeGroupInput')
+    group_out = nodes.new('NodeGroupOutput')
+
+    def math_node(operation, node_type='ShaderNodeMath'):
+        node = nodes.new(node_type)
+        node.operation = operation
+        return node
+
+    # Наклон: угол между нормалью полигона и вектором вверх в локальных координатах объекта
+    normal = nodes.new('GeometryNodeInputNormal')
+    normalize = math_node('NORMALIZE', 'ShaderNodeVectorMath')
+    dot = math_node('DOT_PRODUCT', 'ShaderNodeVectorMath')
+    slope = math_node('ARCCOSINE')
+    steep = math_node('GREATER_THAN')
+    links.new(normal.outputs["Normal"], normalize.inputs[0])
+    links.new(normalize.outputs["Vector"], dot.inputs[0])
+    links.new(group_in.outputs["Up"], dot.inputs[1])
+    links.new(dot.outputs["Value"], slope.inputs[0])
+    links.new(slope.outputs["Value"], steep.inputs[0])
+    links.new(group_in.outputs["Slope Angle"], steep.inputs[1])
+
+    store_steep = nodes.new('GeometryNodeStoreNamedAttribute')
+    store_steep.data_type = 'BOOLEAN'
+    store_steep.domain = 'FACE'
+    store_steep.inputs["Name"].default_value = STEEP_ATTRIBUTE
+    links.new(group_in.outputs["Geometry"], store_steep.inputs["Geometry"])
+    links.new(steep.outputs["Value"], enabled_socket(store_steep.inputs, "Value"))
+
+    # Угол в каждом углу полигона: позиции текущей, следующей и предыдущей вершины полигона
+    index = nodes.new('GeometryNodeInputIndex')
+    position = nodes.new('GeometryNodeInputPosition')
+    corner_points = []
+    for offset in (0, 1, -1):
+        offset_corner = nodes.new('GeometryNodeOffsetCornerInFace')
+        offset_corner.inputs["Offset"].default_value = offset
+        links.new(index.outputs["Index"], offset_corner.inputs["Corner Index"])
+        vertex = nodes.new('GeometryNodeVertexOfCorner')
+        links.new(offset_corner.outputs["Corner Index"], vertex.inputs["Corner Index"])
+        sample = nodes.new('GeometryNodeSampleIndex')
+        sample.data_type = 'FLOAT_VECTOR'
+        sample.domain = 'POINT'
+        links.new(group_in.outputs["Geometry"], sample.inputs["Geometry"])
+        links.new(position.outputs["Position"], enabled_socket(sample.inputs, "Value"))
+        links.new(vertex.outputs["Vertex Index"], sample.inputs["Index"])
+        corner_points.append(enabled_socket(sample.outputs, "Value"))
+
+    directions = []
+    for other in corner_points[1:]:
+        subtract = math_node('SUBTRACT', 'ShaderNodeVectorMath')
+        links.new(other, subtract.inputs[0])
+        links.new(corner_points[0], subtract.inputs[1])
+        direction = math_node('NORMALIZE', 'ShaderNodeVectorMath')
+        links.new(subtract.outputs["Vector"], direction.inputs[0])
+        directions.append(direction.outputs["Vector"])
+
+    corner_dot = math_node('DOT_PRODUCT', 'ShaderNodeVectorMath')
+    links.new(directions[0], corner_dot.inputs[0])
+    links.new(directions[1], corner_dot.inputs[1])
+    corner_angle = math_node('ARCCOSINE')
+    links.new(corner_dot.outputs["Value"], corner_angle.inputs[0])
+    wide = math_node('GREATER_THAN')
+    links.new(corner_angle.outputs["Value"], wide.inputs[0])
+    links.new(group_in.outputs["Triangle Angle"], wide.inputs[1])
+
+    # Флаги углов переводятся в домен полигонов усреднением: больше нуля - хотя бы один угол
+    on_corners = nodes.new('GeometryNodeFieldOnDomain')
+    on_corners.domain = 'CORNER'
+    on_corners.data_type = 'FLOAT'
+    links.new(wide.outputs["Value"], enabled_socket(on_corners.inputs, "Value"))
+
+    face_corners = nodes.new('GeometryNodeCornersOfFace')
+    is_triangle = math_node('COMPARE')
+    is_triangle.inputs[1].default_value = 3.0
+    is_triangle.inputs[2].default_value = 0.5
+    links.new(index.outputs["Index"], face_corners.inputs["Face Index"])
+    links.new(face_corners.outputs["Total"], is_triangle.inputs[0])
+
+    long_triangle = math_node('MULTIPLY')
+    links.new(enabled_socket(on_corners.outputs, "Value"), long_triangle.inputs[0])
+    links.new(is_triangle.outputs["Value"], long_triangle.inputs[1])
+    flagged = math_node('GREATER_THAN')
+    links.new(long_triangle.outputs["Value"], flagged.inputs[0])
+    flagged.inputs[1].default_value = 0.0
+
+    store_long = nodes.new('GeometryNodeStoreNamedAttribute')
+    store_long.data_type = 'BOOLEAN'
+    store_long.domain = 'FACE'
+    store_long.inputs["Name"].default_value = LONG_TRIANGLE_ATTRIBUTE
+    links.new(store_steep.outputs["Geometry"], store_long.inputs["Geometry"])
+    links.new(flagged.outputs["Value"], enabled_socket(store_long.inputs, "Value"))
+    links.new(store_long.outputs["Geometry"], group_out.inputs["Geometry"])
+
+    return group
+
+
+# Функция для вычисления проверок нативно через временный модификатор Geometry Nodes
+# Остальные модификаторы временно выключаются, чтобы полигоны совпадали с исходным мешем
+# Наклон точен для поворота и равномерного масштаба объекта
+# Возвращает (маска крутых полигонов, маска длинных треугольников)
+def evaluate_checks_geometry_nodes(context, obj, slope_threshold, triangle_threshold=LONG_TRIANGLE_ANGLE):
+    group = get_check_node_group()
+
+    # Направление вверх в локальных координатах; нулевое, если объект сплющен больше чем по одной оси
+    up = get_normal_matrix(obj) @ np.array([0.0, 0.0, 1.0])
+    length = np.linalg.norm(up)
+    if length > 0.0:
+        up /= length
+
+    disabled = [modifier for modifier in obj.modifiers if modifier.show_viewport]
+    for modifier in disabled:
+        modifier.show_viewport = False
+
+    modifier = obj.modifiers.new(name=CHECK_NODE_GROUP_NAME, type='NODES')
+    modifier.node_group = group
+    try:
+        sockets = group.interface.items_tree
+        modifier[sockets["Up"].identifier] = up.tolist()
+        modifier[sockets["Slope Angle"].identifier] = math.radians(slope_threshold)
+        modifier[sockets["Triangle Angle"].identifier] = triangle_threshold
+        obj.update_tag()
+
+        mesh_eval = obj.evaluated_get(context.evaluated_depsgraph_get()).data
+        steep = read_attribute(mesh_eval.attributes[STEEP_ATTRIBUTE]).ravel()
+        long_triangles = read_attribute(mesh_eval.attributes[LONG_TRIANGLE_ATTRIBUTE]).ravel()
+    finally:
+        obj.modifiers.remove(modifier)
+        for disabled_modifier in disabled:
+            disabled_modifier.show_viewport = True
+
+    return steep, long_triangles
+
+
+# Допуск сопоставления полигонов вычисленного меша с исходными полигонами
+# в долях радиуса исходного полигона (расстояния от центра до самой дальней вершины)
+EVALUATED_MATCH_SCALE = 2.0
+
+# Кэш геометрии мешей с модификаторами: session_uid объекта -> массивы вычисленного меша
+# Запись удаляется обработчиком depsgraph при изменении геометрии объекта
+evaluated_cache = {}
+
+
+# Функция для вычисления радиуса каждого полигона: расстояние от центра до самой дальней вершины
+def get_face_radii(mesh, centers):
+    loop_starts, loop_totals = get_loop_ranges(mesh)
+    if len(loop_starts) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_faces = np.repeat(np.arange(len(loop_totals)), loop_totals)
+    distances = np.linalg.norm(coords.reshape(-1, 3)[loop_verts] - centers[loop_faces], axis=1)
+    return np.maximum.reduceat(distances, loop_starts)
+
+
+# Функция для получения массивов вычисленного меша (со всеми модификаторами) с кэшированием
+# Полигоны сопоставляются с ближайшим по центру исходным полигоном; допуск зависит от размера
+# исходного полигона, поэтому Triangulate, Subdivision, Decimate и Remesh сопоставляются,
+# а удаленные копии (Array, Mirror) получают -1
+def get_evaluated_arrays(context, obj):
+    arrays = evaluated_cache.get(obj.session_uid)
+    if arrays is not None:
+        return arrays
+
+    obj_eval = obj.evaluated_get(context.evaluated_depsgraph_get())
+    mesh_eval = obj_eval.to_mesh()
+    try:
+        arrays = read_mesh_arrays(mesh_eval)
+    finally:
+        obj_eval.to_mesh_clear()
+
+    original_centers = get_face_centers_precise(obj)[0]
+    if len(arrays["loop_starts"]):
+        centers = np.add.reduceat(arrays["coords"][arrays["loop_verts"]].astype(np.float64),
+                                  arrays["loop_starts"], axis=0)
+        centers /= arrays["loop_totals"][:, None]
+    else:
+        centers = np.empty((0, 3), dtype=np.float64)
+
+    original_faces = map_centers_nearest(original_centers, centers)
+    matched = np.nonzero(original_faces >= 0)[0]
+    distances = np.linalg.norm(centers[matched] - original_centers[original_faces[matched]], axis=1)
+    limits = get_face_radii(obj.data, original_centers)[original_faces[matched]] * EVALUATED_MATCH_SCALE
+    original_faces[matched[distances > limits]] = -1
+    arrays["original_faces"] = original_faces
+
+    evaluated_cache[obj.session_uid] = arrays
+    return arrays
+
+
+# Функция для переноса маски полигонов вычисленного меша на исходные полигоны
+# Исходный полигон отмечается, если отмечен хотя бы один полученный из него полигон
+# Возвращает (маска исходных полигонов, количество отмеченных полигонов без исходного)
+def mask_to_original_faces(mask, original_faces, face_count):
+    result = np.zeros(face_count, dtype=bool)
+    result[original_faces[mask & (original_faces >= 0)]] = True
+    return result, int(np.count_nonzero(mask & (original_faces < 0)))
+
+
+# Функция для получения маски крутых полигонов выбранным в сцене способом
+# Возвращает (маска, количество отмеченных полигонов вычисленного меша без исходного)
+def get_steep_face_mask(context, obj, mesh, threshold_angle):
+    if context.scene.use_evaluated_mesh:
+        arrays = get_evaluated_arrays(context, obj)
+        mask = compute_face_slopes(obj, normals=arrays["normals"]) > threshold_angle
+        return mask_to_original_faces(mask, arrays["original_faces"], len(mesh.polygons))
+    if context.scene.check_backend == 'GEOMETRY_NODES':
+        return evaluate_checks_geometry_nodes(context, obj, threshold_angle)[0], 0
+    return compute_face_slopes(obj, mesh) > threshold_angle, 0
+
+
+# Функция для получения маски длинных треугольников выбранным в сцене способом
+# Возвращает (маска, количество отмеченных полигонов вычисленного меша без исходного)
+def get_long_triangle_mask(context, obj, mesh):
+    if context.scene.use_evaluated_mesh:
+        arrays = get_evaluated_arrays(context, obj)
+        mask = find_long_triangles(None, arrays=arrays)
+        return mask_to_original_faces(mask, arrays["original_faces"], len(mesh.polygons))
+    if context.scene.check_backend == 'GEOMETRY_NODES':
+        return evaluate_checks_geometry_nodes(context, obj, 0.0)[1], 0
+    return find_long_triangles(mesh), 0
+
+
+# Оператор для сравнения результатов и времени проверок на Python и Geometry Nodes
+class OBJECT_OT_compare_check_backends(bpy.types.Operator):
+    bl_idname = "object.compare_check_backends"
+    bl_label = "Compare Check Backends"
+    bl_description = "Run slope and long triangle checks with Python and Geometry Nodes and compare the results"
+
+    def execute(self, context):
+        groups = group_objects_by_mesh(context.selected_objects)
+        if not groups:
+            self.report({'WARNING'}, "Нет выбранных мешей!")
+            return {'CANCELLED'}
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        threshold_angle = context.scene.collision_threshold_angle_slider
+        python_time = 0.0
+        nodes_time = 0.0
+        mismatches = 0
+
+        for mesh, objs in groups.items():
+            start = time.perf_counter()
+            steep = compute_face_slopes(objs[0], mesh) > threshold_angle
+            long_triangles = find_long_triangles(mesh)
+            python_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            nodes_steep, nodes_long_triangles = evaluate_checks_geometry_nodes(context, objs[0], threshold_angle)
+            nodes_time += time.perf_counter() - start
+
+            mesh_mismatches = int(np.count_nonzero(steep != nodes_steep)) + \
+                int(np.count_nonzero(long_triangles != nodes_long_triangles))
+            if mesh_mismatches:
+                print(f"{objs[0].name}: расхождений {mesh_mismatches}")
+            mismatches += mesh_mismatches
+
+        self.report({'INFO'}, f"Python: {python_time:.3f} с, Geometry Nodes: {nodes_time:.3f} с, "
+                              f"расхождений: {mismatches} ({format_mesh_counts(groups)}).")
+        return {'FINISHED'}
+
+
+# Функция для разбиения отмеченных полигонов на связные острова (union-find на массивах)
+# Соседними считаются полигоны с общим ребром; возвращает номер острова для каждого полигона (-1 - не отмечен)
+def find_face_islands(mesh, face_mask):
+    _loop_starts, loop_totals = get_loop_ranges(mesh)
+    loop_faces = np.repeat(np.arange(len(loop_totals)), loop_totals)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+
+    # Пары отмеченных полигонов с общим ребром
+    keep = face_mask[loop_faces]
+    edges = loop_edges[keep]
+    faces = loop_faces[keep]
+    order = np.argsort(edges, kind='stable')
+    edges = edges[order]
+    faces = faces[order]
+    shared = edges[1:] == edges[:-1]
+    face_a = faces[:-1][shared]
+    face_b = faces[1:][shared]
+
+    # Корни подвешиваются к меньшему корню, затем пути сжимаются, пока все пары не совпадут
+    parent = np.arange(len(face_mask))
+    while True:
+        root_a = parent[face_a]
+        root_b = parent[face_b]
+        differ = root_a != root_b
+        if not differ.any():
+            break
+        low = np.minimum(root_a[differ], root_b[differ])
+        np.minimum.at(parent, root_a[differ], low)
+        np.minimum.at(parent, root_b[differ], low)
+        while True:
+            grand = parent[parent]
+            if (grand == parent).all():
+                break
+            parent = grand
+
+    islands = np.full(len(face_mask), -1, dtype=np.int64)
+    _roots, islands[face_mask] = np.unique(parent[face_mask], return_inverse=True)
+    return islands
+
+
+# Функция для вычисления площади и габаритов полигонов в мировых координатах
+# Возвращает (площади, минимумы и максимумы координат вершин каждого полигона)
+def compute_face_bounds_world(obj, mesh):
+    loop_starts, loop_totals = get_loop_ranges(mesh)
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    points = (coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3])[loop_verts]
+    if len(loop_starts) == 0:
+        return np.empty(0), np.empty((0, 3)), np.empty((0, 3))
+
+    # Площадь по формуле Ньюэлла: половина длины суммы векторных произведений соседних вершин
+    loop_faces = np.repeat(np.arange(len(loop_totals)), loop_totals)
+    offsets = np.arange(len(loop_verts)) - loop_starts[loop_faces]
+    next_points = points[loop_starts[loop_faces] + (offsets + 1) % loop_totals[loop_faces]]
+    area_vectors = np.add.reduceat(np.cross(points, next_points), loop_starts, axis=0)
+    areas = 0.5 * np.linalg.norm(area_vectors, axis=1)
+
+    return areas, np.minimum.reduceat(points, loop_starts, axis=0), np.maximum.reduceat(points, loop_starts, axis=0)
+
+
+# Оператор для поиска связных островов крутых полигонов
+class OBJECT_OT_steep_islands(bpy.types.Operator):
+    bl_idname = "object.steep_islands"
+    bl_label = "Steep Islands"
+    bl_description = "Group faces steeper than the threshold angle into connected islands and select large ones"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    min_island_area: bpy.props.FloatProperty(
+        name="Min Island Area", default=1.0, min=0.0, subtype='AREA',
+        description="Only islands with at least this world-space area are selected and reported",
+    )
+
+    def execute(self, context):
+        groups = group_objects_by_mesh(context.selected_objects)
+        if not groups:
+            self.report({'WARNING'}, "Нет выбранных мешей!")
+            return {'CANCELLED'}
 
-            # Нормаль пола (направление вверх)
-            up_vector = Vector((0, 0, 1))
+        threshold_angle = context.scene.collision_threshold_angle_slider
 
-            # Получаем значение угла из UI
-            threshold_angle = context.scene.collision_threshold_angle_slider
+        was_edit = context.mode == 'EDIT_MESH'
+        if was_edit:
+            bpy.ops.object.mode_set(mode='OBJECT')
 
-            # Выбираем полигоны, наклоненные больше порогового угла
-            for face in bm.faces:
-                angle = degrees(face.normal.angle(up_vector))
-                if angle > threshold_angle:
-                    face.select = True
+        island_total = 0
+        for mesh, objs in groups.items():
+            obj = objs[0]
+            islands = find_face_islands(mesh, compute_face_slopes(obj, mesh) > threshold_angle)
+            island_count = int(islands.max(initial=-1)) + 1
+            if island_count == 0:
+                write_face_selection(mesh, islands >= 0)
+                continue
 
-            # Обновляем меш
-            bmesh.update_edit_mesh(me, loop_triangles=True)
+            # Площадь, количество полигонов и габариты каждого острова
+            areas, bounds_min, bounds_max = compute_face_bounds_world(obj, mesh)
+            steep = islands >= 0
+            island_ids = islands[steep]
+            island_areas = np.bincount(island_ids, weights=areas[steep], minlength=island_count)
+            island_faces = np.bincount(island_ids, minlength=island_count)
+            island_min = np.full((island_count, 3), np.inf)
+            island_max = np.full((island_count, 3), -np.inf)
+            np.minimum.at(island_min, island_ids, bounds_min[steep])
+            np.maximum.at(island_max, island_ids, bounds_max[steep])
+
+            large = island_areas >= self.min_island_area
+            write_face_selection(mesh, steep & large[np.maximum(islands, 0)])
+            island_total += int(np.count_nonzero(large))
+
+            for i in np.argsort(-island_areas).tolist():
+                if not large[i]:
+                    break
+                size = island_max[i] - island_min[i]
+                print(f"{obj.name}: остров {i}, площадь {island_areas[i]:.3f}, полигонов {island_faces[i]}, "
+                      f"габариты {size[0]:.2f} x {size[1]:.2f} x {size[2]:.2f}, "
+                      f"от {tuple(round(v, 2) for v in island_min[i].tolist())}")
+
+        if was_edit:
+            bpy.ops.object.mode_set(mode='EDIT')
 
+        self.report({'INFO'}, f"Крутых островов больше минимальной площади: {island_total} "
+                              f"({format_mesh_counts(groups)}).")
+        return {'FINISHED'}
+
+
+# Функция для разбора списка границ диапазонов наклона, например "30, 45, 60"
+def parse_slope_bands(text):
+    bands = []
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if part:
+            try:
+                bands.append(float(part))
+            except ValueError:
+                return None
+    return sorted(bands)
+
+
+# Функция для получения материала диапазона наклона с цветом от зеленого к красному
+def get_slope_band_material(band, band_count):
+    name = f"slope_band_{band}"
+    mat = bpy.data.materials.get(name)
+    if not mat:
+        mat = bpy.data.materials.new(name=name)
+        t = band / max(band_count - 1, 1)
+        mat.diffuse_color = (t, 1.0 - t, 0.0, 1.0)
+    return mat
+
+
+# Оператор для классификации полигонов по диапазонам наклона за один проход
+# Номер диапазона пишется в целочисленный атрибут полигонов slope_band
+class OBJECT_OT_classify_slopes(bpy.types.Operator):
+    bl_idname = "object.classify_slopes"
+    bl_label = "Classify Slopes"
+    bl_description = "Classify faces of selected meshes into slope bands in world space"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    assign_materials: bpy.props.BoolProperty(
+        name="Assign Materials",
+        description="Assign a slope_band_N material to faces of every band",
+        default=False,
+    )
+
+    def execute(self, context):
+        bands = parse_slope_bands(context.scene.slope_bands)
+        if not bands:
+            self.report({'WARNING'}, "Укажите границы диапазонов через запятую, например 30, 45, 60!")
+            return {'CANCELLED'}
+
+        groups = group_objects_by_mesh(context.selected_objects)
+        if not groups:
+            self.report({'WARNING'}, "Нет выбранных мешей!")
+            return {'CANCELLED'}
+
+        was_edit = context.mode == 'EDIT_MESH'
+        if was_edit:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        band_count = len(bands) + 1
+        band_materials = [get_slope_band_material(i, band_count) for i in range(band_count)] \
+            if self.assign_materials else None
+        totals = np.zeros(band_count, dtype=np.int64)
+
+        for mesh, objs in groups.items():
+            classes = np.digitize(compute_face_slopes(objs[0], mesh), bands).astype(np.int32)
+            totals += np.bincount(classes, minlength=band_count)
+
+            attr = mesh.attributes.get("slope_band")
+            if attr and (attr.domain != 'FACE' or attr.data_type != 'INT'):
+                mesh.attributes.remove(attr)
+                attr = None
+            if attr is None:
+                attr = mesh.attributes.new(name="slope_band", type='INT', domain='FACE')
+            write_attribute(attr, classes)
+
+            if band_materials:
+                remap = build_slot_remap(band_materials, mesh.materials)
+                write_material_indices(mesh, remap[classes])
+
+        if was_edit:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+        limits = [0.0] + bands + [180.0]
+        for i, count in enumerate(totals.tolist()):
+            print(f"{limits[i]:g}-{limits[i + 1]:g}°: {count}")
+
+        summary = ", ".join(str(count) for count in totals.tolist())
+        self.report({'INFO'}, f"Полигонов по диапазонам: {summary} ({format_mesh_counts(groups)}).")
+        return {'FINISHED'}
+
+
+# Префиксы имен коллизий
+COLLISION_PREFIXES = ("UCX_", "UBX_", "UCP_", "USP_")
+
+# Формат имени материала: idNNN_
+MATERIAL_NAME_PATTERN = re.compile(r"id(\d+)_")
+
+# Кэш результатов проверки: session_uid меша -> (является ли коллизией, список ошибок)
+# Запись удаляется обработчиком depsgraph при изменении меша
+validation_cache = {}
+
+
+# Функция для проверки меша на соответствие правилам именования Chillbase
+# Возвращает список ошибок (код, описание)
+def validate_mesh(mesh, is_collision):
+    issues = []
+
+    for i, layer in enumerate(mesh.uv_layers):
+        expected = f"UVChannel_{i + 1}"
+        if layer.name != expected:
+            issues.append(('UV_NAME', f"UV-канал '{layer.name}' должен называться '{expected}'"))
+
+    color_attributes = mesh.color_attributes
+    for i, attr in enumerate(color_attributes):
+        expected = f"VCC Colour_{i + 1}" if len(color_attributes) > 1 else "VCC Colour"
+        if attr.name != expected:
+            issues.append(('COLOR_NAME', f"Color Attribute '{attr.name}' должен называться '{expected}'"))
+
+    for i, mat in enumerate(mesh.materials):
+        if mat is None:
+            issues.append(('EMPTY_SLOT', f"Пустой слот материала {i}"))
+        elif not MATERIAL_NAME_PATTERN.match(mat.name):
+            issues.append(('MATERIAL_NAME', f"Материал '{mat.name}' не соответствует формату 'idX_'"))
+
+    if is_collision:
+        for name in ("sharp_edge", "sharp_face"):
+            if name in mesh.attributes:
+                issues.append(('COLLISION_SHARP', f"На коллизии есть атрибут {name}"))
+
+    return issues
+
+
+# Функция для проверки, можно ли изменять меш: связанные из библиотек меши
+# и системные (нередактируемые) переопределения библиотек не исправляются
+def is_mesh_editable(mesh):
+    if mesh.library:
+        return False
+    override = mesh.override_library
+    return not (override and override.is_system_override)
+
+
+# Функция для исправления ошибок, которые можно исправить автоматически
+def fix_mesh_issues(mesh, is_collision):
+    for i, layer in enumerate(mesh.uv_layers):
+        layer.name = f"UVChannel_{i + 1}"
+
+    color_attributes = mesh.color_attributes
+    for i, attr in enumerate(color_attributes):
+        attr.name = f"VCC Colour_{i + 1}" if len(color_attributes) > 1 else "VCC Colour"
+
+    if is_collision:
+        for name in ("sharp_edge", "sharp_face"):
+            attr = mesh.attributes.get(name)
+            if attr:
+                mesh.attributes.remove(attr)
+
+
+# Функция для получения результата проверки меша с использованием кэша
+# Возвращает (список ошибок, взят ли результат из кэша)
+def get_mesh_issues(mesh, is_collision, use_cache=True):
+    cached = validation_cache.get(mesh.session_uid)
+    if use_cache and cached and cached[0] == is_collision:
+        return cached[1], True
+
+    issues = validate_mesh(mesh, is_collision)
+    validation_cache[mesh.session_uid] = (is_collision, issues)
+    return issues, False
+
+
+# Задержка живой проверки после последнего изменения (в секундах)
+LIVE_CHECK_DELAY = 0.5
+
+# Состояние живой проверки: session_uid измененных объектов, время последнего изменения,
+# session_uid объектов, чье следующее обновление вызвано самой проверкой,
+# и флаг выполнения проверки (обновления во время нее вызваны самой проверкой)
+live_check_state = {"pending": set(), "last_change": 0.0, "ignored": set(), "running": False}
+
+# Результаты живой проверки: session_uid меша -> (имя объекта, крутых полигонов, длинных треугольников)
+live_check_results = {}
+
+
+# Функция для постановки объектов в очередь живой проверки с отложенным запуском
+def queue_live_check(uids):
+    live_check_state["pending"].update(uids)
+    live_check_state["last_change"] = time.monotonic()
+    # Таймер снимается при загрузке файла, поэтому проверяем его наличие, а не флаг
+    if not bpy.app.timers.is_registered(run_live_checks):
+        bpy.app.timers.register(run_live_checks, first_interval=LIVE_CHECK_DELAY)
+
+
+# Таймер живой проверки: ждет паузы в изменениях и проверяет только измененные объекты
+# Маски считаются теми же функциями, что и кнопки проверки (модификаторы, Geometry Nodes)
+def run_live_checks():
+    elapsed = time.monotonic() - live_check_state["last_change"]
+    if elapsed < LIVE_CHECK_DELAY:
+        return LIVE_CHECK_DELAY - elapsed
+
+    pending = live_check_state["pending"]
+    live_check_state["pending"] = set()
+
+    scene = bpy.context.scene
+    if not scene.live_checks:
+        return None
+
+    # Временный модификатор Geometry Nodes меняет объект, и его обновление тоже не должно
+    # снова запускать проверку
+    uses_nodes = scene.check_backend == 'GEOMETRY_NODES' and not scene.use_evaluated_mesh
+    context = bpy.context
+    live_check_state["running"] = True
+    try:
+        for obj in bpy.data.objects:
+            if obj.session_uid not in pending or obj.type != 'MESH':
+                continue
+            if obj.mode == 'EDIT' or uses_nodes:
+                live_check_state["ignored"].add(obj.session_uid)
+            if obj.mode == 'EDIT':
+                obj.update_from_editmode()
+
+            mesh = obj.data
+            steep = 0
+            long_triangles = 0
+            if 'SLOPE' in scene.live_check_types:
+                mask = get_steep_face_mask(context, obj, mesh, scene.collision_threshold_angle_slider)[0]
+                steep = int(np.count_nonzero(mask))
+            if 'LONG_TRIANGLES' in scene.live_check_types:
+                long_triangles = int(np.count_nonzero(get_long_triangle_mask(context, obj, mesh)[0]))
+            live_check_results[mesh.session_uid] = (obj.name, steep, long_triangles)
+    finally:
+        live_check_state["running"] = False
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+    return None
+
+
+# Функция обновления свойства live_checks: при включении проверяются выделенные меши
+def update_live_checks(self, context):
+    live_check_results.clear()
+    if self.live_checks:
+        queue_live_check(obj.session_uid for obj in context.selected_objects if obj.type == 'MESH')
+
+
+# Обработчик depsgraph: сбрасывает кэш проверки для измененных мешей
+# и ставит объекты с измененной геометрией в очередь живой проверки
+@persistent
+def invalidate_changed_meshes(scene, depsgraph):
+    live_changed = []
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Mesh):
+            validation_cache.pop(id_data.session_uid, None)
+        elif isinstance(id_data, bpy.types.Material):
+            # Переименование материала влияет на все меши, где он используется
+            validation_cache.clear()
+        elif isinstance(id_data, bpy.types.Object) and id_data.type == 'MESH':
+            if update.is_updated_geometry:
+                evaluated_cache.pop(id_data.session_uid, None)
+            if live_check_state["running"]:
+                continue
+            if update.is_updated_geometry or update.is_updated_transform:
+                if id_data.session_uid in live_check_state["ignored"]:
+                    live_check_state["ignored"].discard(id_data.session_uid)
+                else:
+                    live_changed.append(id_data.session_uid)
+
+    if live_changed and scene.live_checks:
+        queue_live_check(live_changed)
+
+
+# Обработчик загрузки файла: кэш предыдущего файла больше не актуален
+@persistent
+def clear_caches_on_load(*args):
+    validation_cache.clear()
+    evaluated_cache.clear()
+    live_check_results.clear()
+    live_check_state["pending"].clear()
+    live_check_state["ignored"].clear()
+
+
+# Оператор для проверки всех мешей файла на соответствие правилам Chillbase
+class OBJECT_OT_validate_scene(bpy.types.Operator):
+    bl_idname = "object.validate_scene"
+    bl_label = "Validate Scene"
+    bl_description = "Check UV, color attribute and material naming and collision attributes for all meshes"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    auto_fix: bpy.props.BoolProperty(
+        name="Auto Fix",
+        description="Rename UV channels and color attributes, remove sharp attributes from collision",
+        default=False,
+    )
+    full_rescan: bpy.props.BoolProperty(
+        name="Full Rescan",
+        description="Ignore cached results and check every mesh again",
+        default=False,
+    )
+
+    def execute(self, context):
+        groups = group_objects_by_mesh(bpy.data.objects)
+        if not groups:
+            self.report({'WARNING'}, "В файле нет мешей!")
+            return {'CANCELLED'}
+
+        cached_count = 0
+        issue_count = 0
+        failed_meshes = 0
+        not_fixable = 0
+
+        for mesh, objs in groups.items():
+            is_collision = any(obj.name.startswith(COLLISION_PREFIXES) for obj in objs)
+            issues, from_cache = get_mesh_issues(mesh, is_collision, not self.full_rescan)
+            cached_count += from_cache
+
+            if issues and self.auto_fix:
+                if is_mesh_editable(mesh):
+                    fix_mesh_issues(mesh, is_collision)
+                    issues, _from_cache = get_mesh_issues(mesh, is_collision, use_cache=False)
+                else:
+                    not_fixable += 1
+                    print(f"{mesh.name} ({objs[0].name}): меш связан из библиотеки, исправление невозможно")
+
+            if issues:
+                failed_meshes += 1
+                issue_count += len(issues)
+                for _code, message in issues:
+                    print(f"{mesh.name} ({objs[0].name}): {message}")
+
+        summary = f"Проверено мешей: {len(groups)} (из кэша: {cached_count}). " \
+                  f"Мешей с ошибками: {failed_meshes}, ошибок: {issue_count}."
+        if not_fixable:
+            summary += f" Не исправлено связанных мешей: {not_fixable}."
+        self.report({'WARNING'} if issue_count else {'INFO'}, summary)
         return {'FINISHED'}
 
 
@@ -525,9 +2643,26 @@ class OBJECT_PT_my_panel(bpy.types.Panel):
         layout.prop(scene, "obj_from", text="Source Object")
         layout.prop(scene, "obj_to", text="Target Object")
 
+        # Режим сопоставления полигонов при переносе материалов
+        layout.prop(scene, "transfer_mode", text="Match")
+        if scene.transfer_mode == 'NEAREST':
+            layout.prop(scene, "transfer_max_distance", text="Max Distance")
+        elif scene.transfer_mode == 'UV':
+            layout.prop(scene, "transfer_uv_channel", text="UV Channel")
+            layout.prop(scene, "transfer_uv_tolerance", text="UV Tolerance")
+        layout.prop(scene, "transfer_keep_slots")
+
+        # Типы атрибутов, переносимых вместе с материалами или отдельной кнопкой
+        layout.prop(scene, "transfer_attribute_types")
+        layout.operator("object.transfer_attributes")
+
         # Кнопка для переноса материалов
         layout.operator("object.my_button")
 
+        # Пакетный перенос материалов по шаблонам имен
+        layout.prop(scene, "batch_target_patterns", text="Targets")
+        layout.operator("object.batch_transfer_materials")
+
         # Кнопка для переименования UV
         layout.operator("object.rename_uv")
 
@@ -538,22 +2673,81 @@ class OBJECT_PT_my_panel(bpy.types.Panel):
         layout.prop(scene, "collision_threshold_angle_slider", text="Threshold Angle")
         layout.operator("object.check_collision_slope_angle", text="Check Collision Slope Angle")  # Убрана строка с tooltip
 
+        # Способ вычисления проверок наклона и длинных треугольников
+        layout.prop(scene, "check_backend", text="Backend")
+        layout.prop(scene, "use_evaluated_mesh")
+        layout.operator("object.compare_check_backends")
+
+        # Живая проверка измененных объектов
+        layout.prop(scene, "live_checks")
+        if scene.live_checks:
+            layout.prop(scene, "live_check_types")
+            problems = [result for result in live_check_results.values() if result[1] or result[2]]
+            box = layout.box()
+            box.label(text=f"Steep: {sum(r[1] for r in problems)}, Long: {sum(r[2] for r in problems)}")
+            for name, steep, long_triangles in sorted(problems, key=lambda r: r[1] + r[2], reverse=True)[:5]:
+                box.label(text=f"{name}: {steep} / {long_triangles}", icon='ERROR')
+
+        # Кнопка для поиска связных островов крутых полигонов
+        layout.operator("object.steep_islands")
+
+        # Классификация наклона по нескольким диапазонам
+        layout.prop(scene, "slope_bands", text="Bands")
+        layout.operator("object.classify_slopes")
+
         # Кнопка для очистки объектов
         layout.operator("object.clean_collision")
 
         # Кнопка для Long Triangles
         layout.operator("object.long_triangles")
+        layout.operator("object.repair_long_triangles")
+
+        # Кнопка для анализа качества сетки
+        layout.operator("object.mesh_quality")
 
         # Кнопка для удаления материалов
         layout.operator("object.delete_materials", icon='MATERIAL')
 
+        # Кнопка для удаления неиспользуемых материалов во всем файле
+        layout.operator("object.purge_unused_materials", icon='TRASH')
+
+        # Кнопка для объединения дубликатов материалов
+        layout.operator("object.merge_duplicate_materials", icon='MATERIAL')
+
         # Кнопка для назначения материалов и путь к текстурам
         layout.prop(context.scene, "texture_folder_path")
         layout.operator("object.assign_materials_from_color", text="Assign Materials from Color", icon='MATERIAL')
 
+        # Кэш текстур: лимит, статистика и очистка
+        layout.prop(scene, "texture_cache_limit")
+        layout.prop(scene, "texture_disk_cache")
+        if scene.texture_disk_cache:
+            layout.prop(scene, "texture_disk_cache_in_folder")
+        layout.label(text=f"Cache: {len(texture_cache)} tiles, {texture_cache_stats['bytes'] / 1048576:.0f} MB, "
+                          f"hits {texture_cache_stats['hits']} / misses {texture_cache_stats['misses']}")
+        layout.operator("object.clear_texture_cache", icon='TRASH')
+
         # Кнопка для назначения материалов из альфы
         layout.operator("object.assign_materials_by_alpha", icon='MATERIAL')
 
+        # Кнопки для проверки всех мешей файла
+        layout.operator("object.validate_scene", icon='CHECKMARK')
+        layout.operator("object.validate_scene", text="Validate & Fix").auto_fix = True
+
+
+# Оператор для очистки кэша текстур
+class OBJECT_OT_clear_texture_cache(bpy.types.Operator):
+    bl_idname = "object.clear_texture_cache"
+    bl_label = "Clear Texture Cache"
+    bl_description = "Free decoded textures kept between Assign Materials from Color runs and delete the disk cache"
+
+    def execute(self, context):
+        # Сначала освобождаются отображенные в память файлы, иначе Windows не даст их удалить
+        clear_texture_cache()
+        removed = clear_disk_cache(context.scene.texture_folder_path)
+        self.report({'INFO'}, f"Кэш текстур очищен, удалено файлов кэша на диске: {removed}.")
+        return {'FINISHED'}
+
 
 # Оператор для кнопки
 class OBJECT_OT_AssignMaterials(bpy.types.Operator):
@@ -562,21 +2756,37 @@ class OBJECT_OT_AssignMaterials(bpy.types.Operator):
 
     def execute(self, context):
         folder_path = context.scene.texture_folder_path
-        assign_textures_to_meshes_from_folder(folder_path)
+        groups = assign_textures_to_meshes_from_folder(folder_path)
+        if groups is None:
+            self.report({'WARNING'}, f"Папка {folder_path} не найдена.")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Материалы назначены ({format_mesh_counts(groups)}).")
         return {'FINISHED'}
 
 
 # Регистрация классов и свойств
 def register():
     bpy.utils.register_class(OBJECT_OT_my_button)
+    bpy.utils.register_class(OBJECT_OT_transfer_attributes)
+    bpy.utils.register_class(OBJECT_OT_batch_transfer_materials)
     bpy.utils.register_class(OBJECT_OT_rename_uv)
     bpy.utils.register_class(OBJECT_OT_rename_vc)
     bpy.utils.register_class(OBJECT_OT_clean_collision)
     bpy.utils.register_class(OBJECT_OT_long_triangles)
+    bpy.utils.register_class(OBJECT_OT_repair_long_triangles)
+    bpy.utils.register_class(OBJECT_OT_mesh_quality)
     bpy.utils.register_class(OBJECT_OT_delete_materials)
+    bpy.utils.register_class(OBJECT_OT_purge_unused_materials)
+    bpy.utils.register_class(OBJECT_OT_merge_duplicate_materials)
     bpy.utils.register_class(OBJECT_OT_AssignMaterials)
+    bpy.utils.register_class(OBJECT_OT_clear_texture_cache)
     bpy.utils.register_class(OBJECT_OT_AssignMaterialsByAlpha)
     bpy.utils.register_class(CollisionAngleSelectorOperator)
+    bpy.utils.register_class(OBJECT_OT_classify_slopes)
+    bpy.utils.register_class(OBJECT_OT_compare_check_backends)
+    bpy.utils.register_class(OBJECT_OT_steep_islands)
+    bpy.utils.register_class(OBJECT_OT_validate_scene)
     bpy.utils.register_class(OBJECT_PT_my_panel)
 
     # Свойство для ползунка выбора угла полигонов
@@ -584,6 +2794,44 @@ def register():
         name="Threshold Angle", default=60.0, min=0.0, max=90.0, description="Angle threshold for collision detection"
     )
 
+    # Свойство для выбора способа вычисления проверок
+    bpy.types.Scene.check_backend = bpy.props.EnumProperty(
+        name="Check Backend",
+        description="How slope and long triangle checks are computed",
+        items=[
+            ('PYTHON', "Python", "Compute checks with NumPy arrays"),
+            ('GEOMETRY_NODES', "Geometry Nodes", "Compute checks natively with a generated Geometry Nodes group"),
+        ],
+        default='PYTHON',
+    )
+
+    # Свойство для проверки меша с учетом модификаторов
+    bpy.types.Scene.use_evaluated_mesh = bpy.props.BoolProperty(
+        name="Use Modifiers", default=False,
+        description="Run slope and long triangle checks on the mesh with all modifiers applied",
+    )
+
+    # Свойства для живой проверки
+    bpy.types.Scene.live_checks = bpy.props.BoolProperty(
+        name="Live Checks", default=False, update=update_live_checks,
+        description="Re-run checks on changed meshes automatically after a short pause",
+    )
+    bpy.types.Scene.live_check_types = bpy.props.EnumProperty(
+        name="Live Check Types",
+        description="Checks run by live validation",
+        items=[
+            ('SLOPE', "Slope", "Faces steeper than the threshold angle"),
+            ('LONG_TRIANGLES', "Long Triangles", "Triangles with a too wide angle"),
+        ],
+        options={'ENUM_FLAG'},
+        default={'SLOPE', 'LONG_TRIANGLES'},
+    )
+
+    # Свойство для границ диапазонов наклона
+    bpy.types.Scene.slope_bands = bpy.props.StringProperty(
+        name="Slope Bands", default="30, 45, 60", description="Comma separated upper limits of slope bands in degrees"
+    )
+
     # Свойства для выбора объектов
     bpy.types.Scene.obj_from = bpy.props.PointerProperty(
         type=bpy.types.Object,
@@ -595,31 +2843,134 @@ def register():
         name="Target Object",
         description="Object to transfer materials to",
     )
+    bpy.types.Scene.transfer_mode = bpy.props.EnumProperty(
+        name="Transfer Mode",
+        description="How faces of the target object are matched to the source",
+        items=[
+            ('INDEX', "By Index", "Faces are matched by index, face counts must be equal"),
+            ('NEAREST', "Nearest Face", "Faces are matched by the nearest source face center"),
+            ('EXACT', "Exact Match", "Faces are matched by identical center and vertex count, order may differ"),
+            ('UV', "UV Space", "Faces are matched by the nearest source face center in UV space"),
+        ],
+        default='INDEX',
+    )
+    bpy.types.Scene.transfer_max_distance = bpy.props.FloatProperty(
+        name="Max Distance",
+        description="Maximum distance for nearest face matching (0 - no limit)",
+        default=0.0,
+        min=0.0,
+        subtype='DISTANCE',
+    )
+    bpy.types.Scene.transfer_uv_channel = bpy.props.StringProperty(
+        name="UV Channel",
+        description="UV channel used for UV space face matching",
+        default="UVChannel_1",
+    )
+    bpy.types.Scene.transfer_uv_tolerance = bpy.props.FloatProperty(
+        name="UV Tolerance",
+        description="Maximum distance between face UV centers for UV space matching, in UV units (0 - no limit)",
+        default=0.0,
+        min=0.0,
+        precision=4,
+    )
+    bpy.types.Scene.transfer_keep_slots = bpy.props.BoolProperty(
+        name="Keep Target Slots",
+        description="Keep existing material slots of the target and remap face indices to them",
+        default=False,
+    )
+    bpy.types.Scene.transfer_attribute_types = bpy.props.EnumProperty(
+        name="Attributes",
+        description="Attribute types transferred together with materials",
+        items=[
+            ('UV', "UV", "UV maps"),
+            ('COLOR', "Colors", "Color attributes"),
+            ('SHARP', "Sharp", "sharp_edge and sharp_face flags"),
+            ('CUSTOM', "Custom", "Other point, edge, face and corner attributes"),
+        ],
+        options={'ENUM_FLAG'},
+        default=set(),
+    )
+    bpy.types.Scene.batch_target_patterns = bpy.props.StringProperty(
+        name="Target Patterns",
+        description="Comma separated target name patterns, {name} is replaced with the source object name",
+        default="{name}_LOD1, UCX_{name}",
+    )
     bpy.types.Scene.texture_folder_path = bpy.props.StringProperty(
         name="Texture Folder",
         description="Path to the folder with textures",
         default="",
         subtype='DIR_PATH'
     )
+    bpy.types.Scene.texture_disk_cache = bpy.props.BoolProperty(
+        name="Disk Cache",
+        description="Keep decoded textures as .npy files in the Blender user data folder and memory-map them",
+        default=True,
+    )
+    bpy.types.Scene.texture_disk_cache_in_folder = bpy.props.BoolProperty(
+        name="Cache Next to Textures",
+        description="Store the disk cache in a hidden .chillbase_cache folder inside the texture folder",
+        default=False,
+    )
+    bpy.types.Scene.texture_cache_limit = bpy.props.IntProperty(
+        name="Cache Limit (MB)",
+        description="Memory limit for decoded textures kept between runs",
+        default=2048,
+        min=0,
+    )
+
+    # Обработчики для сброса кэшей
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_changed_meshes)
+    bpy.app.handlers.load_post.append(clear_caches_on_load)
 
 
 # Удаление классов и свойств при отключении аддона
 def unregister():
     bpy.utils.unregister_class(OBJECT_OT_my_button)
+    bpy.utils.unregister_class(OBJECT_OT_transfer_attributes)
+    bpy.utils.unregister_class(OBJECT_OT_batch_transfer_materials)
     bpy.utils.unregister_class(OBJECT_OT_rename_uv)
     bpy.utils.unregister_class(OBJECT_OT_rename_vc)
     bpy.utils.unregister_class(OBJECT_OT_clean_collision)
     bpy.utils.unregister_class(OBJECT_OT_long_triangles)
+    bpy.utils.unregister_class(OBJECT_OT_repair_long_triangles)
+    bpy.utils.unregister_class(OBJECT_OT_mesh_quality)
     bpy.utils.unregister_class(OBJECT_OT_delete_materials)
+    bpy.utils.unregister_class(OBJECT_OT_purge_unused_materials)
+    bpy.utils.unregister_class(OBJECT_OT_merge_duplicate_materials)
     bpy.utils.unregister_class(OBJECT_OT_AssignMaterials)
+    bpy.utils.unregister_class(OBJECT_OT_clear_texture_cache)
     bpy.utils.unregister_class(OBJECT_OT_AssignMaterialsByAlpha)
     bpy.utils.unregister_class(CollisionAngleSelectorOperator)
+    bpy.utils.unregister_class(OBJECT_OT_classify_slopes)
+    bpy.utils.unregister_class(OBJECT_OT_compare_check_backends)
+    bpy.utils.unregister_class(OBJECT_OT_steep_islands)
+    bpy.utils.unregister_class(OBJECT_OT_validate_scene)
     bpy.utils.unregister_class(OBJECT_PT_my_panel)
 
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_changed_meshes)
+    bpy.app.handlers.load_post.remove(clear_caches_on_load)
+    if bpy.app.timers.is_registered(run_live_checks):
+        bpy.app.timers.unregister(run_live_checks)
+
     del bpy.types.Scene.obj_from
     del bpy.types.Scene.obj_to
+    del bpy.types.Scene.transfer_mode
+    del bpy.types.Scene.transfer_max_distance
+    del bpy.types.Scene.transfer_uv_channel
+    del bpy.types.Scene.transfer_uv_tolerance
+    del bpy.types.Scene.transfer_keep_slots
+    del bpy.types.Scene.transfer_attribute_types
+    del bpy.types.Scene.batch_target_patterns
     del bpy.types.Scene.texture_folder_path
+    del bpy.types.Scene.texture_cache_limit
+    del bpy.types.Scene.texture_disk_cache
+    del bpy.types.Scene.texture_disk_cache_in_folder
     del bpy.types.Scene.collision_threshold_angle_slider
+    del bpy.types.Scene.slope_bands
+    del bpy.types.Scene.check_backend
+    del bpy.types.Scene.use_evaluated_mesh
+    del bpy.types.Scene.live_checks
+    del bpy.types.Scene.live_check_types
 
 
 # Точка входа в аддон